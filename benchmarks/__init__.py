@@ -0,0 +1 @@
+"""Performance benchmarks for the Lead Edge maze core (plain CPython, no bpy)."""
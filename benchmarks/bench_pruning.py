@@ -0,0 +1,81 @@
+"""Round-scan vs worklist dead-end pruning.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pruning --size 1000
+"""
+import argparse
+import random
+import time
+
+from maze_core import generate_maze, solve_by_pruning
+
+
+def round_scan_pruning(grid, start, end, time_limit=None):
+    """Reference copy of the original solve_maze_algebraic (one scan per round).
+
+    Returns (cells, rounds, finished); gives up after ``time_limit`` seconds.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    w, h = grid.width, grid.height
+    cell_degrees = grid.degrees().tolist()
+    degrees = {}
+    active_cells = set()
+    for y in range(h):
+        for x in range(w):
+            active_cells.add((x, y))
+            degrees[(x, y)] = cell_degrees[y][x]
+    degrees[start] += 10
+    degrees[end] += 10
+    rounds = 0
+    while True:
+        dead_ends = [cell for cell in active_cells if degrees[cell] == 1]
+        if not dead_ends:
+            break
+        rounds += 1
+        if deadline is not None and time.perf_counter() > deadline:
+            return list(active_cells), rounds, False
+        for cx, cy in dead_ends:
+            active_cells.remove((cx, cy))
+            for n in grid.open_neighbors(cx, cy):
+                if n in active_cells: degrees[n] -= 1
+    return list(active_cells), rounds, True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=300.0,
+                        help="stop the round-scan reference after this many seconds")
+    parser.add_argument("--skip-reference", action="store_true",
+                        help="only time the worklist solver")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    random.seed(args.seed)
+    grid, start, end = generate_maze(args.size, args.size)
+    print(f"generate {args.size}x{args.size}: {time.perf_counter() - t0:.2f}s")
+
+    t0 = time.perf_counter()
+    path = solve_by_pruning(grid, start, end)
+    fast = time.perf_counter() - t0
+    print(f"worklist pruning:   {fast:.2f}s  ({len(path)} path cells)")
+
+    if args.skip_reference:
+        return
+    t0 = time.perf_counter()
+    cells, rounds, finished = round_scan_pruning(grid, start, end, args.time_limit)
+    slow = time.perf_counter() - t0
+    if not finished:
+        print(f"round-scan pruning: >{slow:.2f}s  (stopped after {rounds} rounds)")
+        print(f"speedup: >{slow / fast:.1f}x")
+        return
+    print(f"round-scan pruning: {slow:.2f}s  ({rounds} rounds)")
+    if sorted(cells) != sorted(path):
+        raise SystemExit("solvers disagree")
+    print(f"speedup: {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
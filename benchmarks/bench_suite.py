@@ -0,0 +1,161 @@
+"""Generation, solving and meshing benchmarks across maze sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_suite --out bench.json
+    python -m benchmarks.bench_suite --sizes 10,100,1000 --compare bench.json
+
+Every stage runs on the same seeded maze per size. Wall time is measured
+without tracing; peak memory comes from a second, tracemalloc-traced run
+(skip it with --no-memory). The dijkstra stage solves with cost_plane step
+costs, as weighted mazes are what it is for. The mesh stage times maze_core.build_wall_mesh,
+which is everything draw_3d_maze does before handing the arrays to Blender,
+so it needs neither bpy nor bmesh.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from maze_core import (braid_maze, build_wall_mesh, cost_plane, get_generator, get_solver,
+                       maze_seeds)
+
+DEFAULT_SIZES = (10, 32, 100, 316, 1000, 2048, 4096)
+STAGES = ("generate", "solve_bfs", "solve_bidirectional", "solve_astar", "solve_dijkstra",
+          "solve_algebraic", "mesh", "mesh_thick")
+
+
+def _measure(func, memory):
+    """Return (result, seconds, peak_bytes) for one call of ``func``."""
+    t0 = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - t0
+    peak = None
+    if memory:
+        del result
+        tracemalloc.start()
+        try:
+            result = func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_size(size, seed, algorithm, stages, memory, braid=0.0):
+    """Benchmark the selected stages on one size x size maze."""
+    generator = get_generator(algorithm)
+    carve_seed, braid_seed, cost_seed = maze_seeds(seed)
+    grid, start, end = generator(size, size, seed=carve_seed)
+    if braid > 0:
+        braid_maze(grid, braid, seed=braid_seed)
+    costs = cost_plane(size, size, seed=cost_seed)
+    jobs = {
+        "generate": lambda: generator(size, size, seed=seed),
+        "solve_bfs": lambda: get_solver("bfs")(grid, start, end),
+        "solve_bidirectional": lambda: get_solver("bidirectional")(grid, start, end),
+        "solve_astar": lambda: get_solver("astar")(grid, start, end),
+        "solve_dijkstra": lambda: get_solver("dijkstra", costs)(grid, start, end),
+        "solve_algebraic": lambda: get_solver("algebraic")(grid, start, end),
+        "mesh": lambda: build_wall_mesh(grid, 1.0, 2.0, start, end),
+        "mesh_thick": lambda: build_wall_mesh(grid, 1.0, 2.0, start, end, thickness=0.2),
+    }
+    results = {}
+    for stage in stages:
+        result, seconds, peak = _measure(jobs[stage], memory)
+        entry = {"seconds": seconds, "peak_bytes": peak}
+        if stage.startswith("solve"):
+            entry["path_cells"] = len(result)
+        elif stage.startswith("mesh"):
+            verts, faces, _ = result
+            entry["vertices"] = len(verts)
+            entry["faces"] = len(faces)
+        results[stage] = entry
+    return results
+
+
+def compare(current, baseline):
+    """Print time and memory ratios against an earlier results file."""
+    old = {(run["size"], stage): entry
+           for run in baseline["runs"] for stage, entry in run["stages"].items()}
+    print("\nvs baseline (ratio > 1 is slower / larger):")
+    for run in current["runs"]:
+        for stage, entry in run["stages"].items():
+            prev = old.get((run["size"], stage))
+            if prev is None:
+                continue
+            line = f"  {run['size']:>5} {stage:<20} time x{entry['seconds'] / prev['seconds']:.2f}"
+            if entry["peak_bytes"] and prev.get("peak_bytes"):
+                line += f"  memory x{entry['peak_bytes'] / prev['peak_bytes']:.2f}"
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated maze sizes (square)")
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help=f"comma separated subset of {', '.join(STAGES)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algorithm", default="backtracker")
+    parser.add_argument("--braid", type=float, default=0.0,
+                        help="open this fraction of dead ends into loops before solving")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc run (halves the run time)")
+    parser.add_argument("--time-limit", type=float, default=120.0,
+                        help="skip larger sizes for a stage once it takes longer than this")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    stages = [s for s in args.stages.split(",") if s]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+
+    report = {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seed": args.seed,
+        "algorithm": args.algorithm,
+        "braid": args.braid,
+        "runs": [],
+    }
+    active = list(stages)
+    for size in sizes:
+        if not active:
+            break
+        stage_results = run_size(size, args.seed, args.algorithm, active, not args.no_memory,
+                                args.braid)
+        report["runs"].append({"size": size, "cells": size * size, "stages": stage_results})
+        for stage, entry in stage_results.items():
+            line = f"{size:>5}x{size:<5} {stage:<20} {entry['seconds']:9.3f}s"
+            if entry["peak_bytes"] is not None:
+                line += f"  {entry['peak_bytes'] / 2**20:9.1f} MB"
+            if "faces" in entry:
+                line += f"  {entry['vertices']} verts / {entry['faces']} faces"
+            elif "path_cells" in entry:
+                line += f"  {entry['path_cells']} path cells"
+            print(line)
+            if entry["seconds"] > args.time_limit:
+                print(f"  {stage} exceeded {args.time_limit:.0f}s; skipping larger sizes")
+                active.remove(stage)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
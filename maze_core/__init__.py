@@ -0,0 +1,62 @@
+"""Blender-independent maze generation, solving and mesh data for Lead Edge.
+
+Everything in this package runs in plain CPython with NumPy, so batch jobs,
+benchmarks and worker processes can use it without a Blender interpreter.
+"""
+from .grid import (
+    MazeGrid,
+    SIDES,
+    SIDE_BITS,
+    OFFSETS,
+    to_cell_dicts,
+    from_cell_dicts,
+    as_maze_grid,
+)
+from .generate import (
+    create_grid,
+    generate_maze,
+    get_random_perimeter_cell,
+    remove_wall,
+)
+from .rng import BlockRandom, make_rng
+from .stats import PhaseStats
+from .prune import prune_dead_ends, solve_by_pruning
+from .solve import (
+    NoRouteError,
+    SOLVERS,
+    WEIGHTED_SOLVERS,
+    get_solver,
+    solve_maze,
+    solve_bfs,
+    solve_bidirectional,
+    solve_astar,
+    solve_dijkstra,
+    path_cost,
+    solve_maze_algebraic,
+)
+from .tree import MazeTree
+from .edit import TiledWallMesh, wall_between, toggle_wall, regenerate_region
+from .cache import LRUCache, grid_fingerprint, cost_fingerprint, solution_key, cached_solve
+from .mesh import (
+    build_wall_mesh,
+    build_path_mesh,
+    extract_wall_runs,
+    runs_to_mesh,
+    runs_to_box_mesh,
+    iter_tiles,
+    tile_fingerprint,
+    wall_instances,
+    perimeter_side,
+)
+from .storage import save_maze, load_maze, pack_maze, unpack_maze
+from .stream import eller_rows, write_streamed_maze, StreamedMaze
+from .generators import (
+    GENERATORS,
+    register_generator,
+    get_generator,
+    generate_tiled,
+    braid_maze,
+    cost_plane,
+    maze_seeds,
+)
+from .export import iter_mesh_tiles, write_glb, write_obj, write_stl, export_maze
@@ -0,0 +1,10 @@
+import sys
+
+if sys.argv[1:2] == ["export"]:
+    from .export import main
+
+    main(sys.argv[2:])
+else:
+    from .batch import main
+
+    main()
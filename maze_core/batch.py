@@ -0,0 +1,115 @@
+"""Headless batch generation of Lead Edge mazes across a process pool.
+
+Run from the repository root (no Blender needed):
+
+    python -m maze_core --count 1000 --size 32:128 --seed 7 --out level_pack
+
+Each maze ``i`` is generated from seed ``seed + i`` (split by maze_seeds, as
+the addons do), so any single maze of a pack can be reproduced on its own. Mazes are written as ``maze_XXXXXX.npz``
+(see maze_core.storage) together with their solution. ``--costs R`` gives
+every maze rolling per-cell step costs from 1 to 1 + R (stored with it), which
+the dijkstra solver routes around. With ``--export glb`` (or obj / stl) each
+maze's walls are also written next to it by maze_core.export.
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .export import WRITERS, export_maze
+from .generators import GENERATORS, braid_maze, cost_plane, get_generator, maze_seeds
+from .solve import SOLVERS, get_solver
+from .storage import save_maze
+
+
+def parse_range(text):
+    """Parse ``N`` or ``MIN:MAX`` into an inclusive (min, max) pair."""
+    lo, _, hi = text.partition(":")
+    lo = int(lo)
+    hi = int(hi) if hi else lo
+    if lo < 1 or hi < lo:
+        raise argparse.ArgumentTypeError(f"invalid size range {text!r}")
+    return lo, hi
+
+
+def build_one(job):
+    """Generate, solve and save one maze; returns (cells, path length)."""
+    (index, seed, width_range, height_range, algorithm, braid, costs, solver, out_dir,
+     export) = job
+    rng = random.Random(seed)
+    width = rng.randint(*width_range)
+    height = rng.randint(*height_range)
+
+    carve_seed, braid_seed, cost_seed = maze_seeds(seed)
+    grid, start, end = get_generator(algorithm)(width, height, seed=carve_seed)
+    if braid > 0:
+        braid_maze(grid, braid, seed=braid_seed)
+    costs = cost_plane(width, height, costs, seed=cost_seed) if costs > 0 else None
+    path = get_solver(solver, costs)(grid, start, end)
+    save_maze(os.path.join(out_dir, f"maze_{index:06d}.npz"),
+              grid, start, end, seed=seed, solution=path, costs=costs)
+    if export:
+        export_maze(os.path.join(out_dir, f"maze_{index:06d}.{export}"), grid, start, end)
+    return width * height, len(path)
+
+
+def run_batch(count, width_range, height_range, seed=0, algorithm="backtracker", braid=0.0,
+              solver="algebraic", out_dir=".", workers=None, chunksize=None,
+              export=None, costs=0.0):
+    """Build ``count`` mazes in parallel; returns (total cells, seconds)."""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(i, seed + i, width_range, height_range, algorithm, braid, costs, solver,
+             out_dir, export)
+            for i in range(count)]
+    if chunksize is None:
+        chunksize = max(1, count // ((workers or os.cpu_count() or 1) * 8))
+
+    t0 = time.perf_counter()
+    total_cells = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for cells, _ in pool.map(build_one, jobs, chunksize=chunksize):
+            total_cells += cells
+    return total_cells, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m maze_core",
+        description="Generate and solve Lead Edge mazes without Blender.")
+    parser.add_argument("--count", type=int, default=100,
+                        help="number of mazes to generate")
+    parser.add_argument("--size", type=parse_range, default=(10, 10),
+                        help="cell count per side, N or MIN:MAX (default 10)")
+    parser.add_argument("--width", type=parse_range,
+                        help="width range, overrides --size")
+    parser.add_argument("--height", type=parse_range,
+                        help="height range, overrides --size")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first maze; maze i uses seed+i")
+    parser.add_argument("--algorithm", choices=sorted(GENERATORS), default="backtracker")
+    parser.add_argument("--braid", type=float, default=0.0,
+                        help="fraction of dead ends opened into loops (0..1)")
+    parser.add_argument("--costs", type=float, default=0.0,
+                        help="roughness of random per-cell step costs (0 = uniform)")
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default="algebraic")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--out", default="mazes", help="output directory")
+    parser.add_argument("--export", choices=[ext[1:] for ext in WRITERS],
+                        help="also write each maze's walls as a mesh file")
+    args = parser.parse_args(argv)
+
+    cells, seconds = run_batch(args.count,
+                               args.width or args.size,
+                               args.height or args.size,
+                               seed=args.seed, algorithm=args.algorithm, braid=args.braid,
+                               solver=args.solver,
+                               out_dir=args.out, workers=args.workers,
+                               export=args.export, costs=args.costs)
+    print(f"{args.count} mazes, {cells} cells in {seconds:.2f}s: "
+          f"{args.count / seconds:.1f} mazes/s, {cells / seconds:,.0f} cells/s")
+
+
+if __name__ == "__main__":
+    main()
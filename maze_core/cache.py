@@ -0,0 +1,146 @@
+"""Bounded LRU cache for solved paths and built path meshes.
+
+Entries are keyed by ``solution_key``: a hash of the wall bit-planes plus
+the endpoints and solver name, and for weighted solvers a hash of the step
+costs. Any edit to the grid or costs changes the key, so a stale entry can
+never be hit; it just ages out. Eviction is by the bytes
+the cached arrays take rather than by entry count, so a handful of huge
+mazes and thousands of small ones both fit the same budget.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .grid import as_maze_grid
+from .solve import WEIGHTED_SOLVERS, get_solver
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+def grid_fingerprint(grid):
+    """Short hash of a grid's size and wall bit-planes."""
+    grid = as_maze_grid(grid)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((grid.width, grid.height)).encode())
+    # Walls are 0/1 bytes; packing them first hashes 8x less data
+    digest.update(np.packbits(grid.horizontal).tobytes())
+    digest.update(np.packbits(grid.vertical).tobytes())
+    return digest.hexdigest()
+
+
+def cost_fingerprint(costs):
+    """Short hash of a per-cell cost plane."""
+    costs = np.ascontiguousarray(costs, dtype=np.float32)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(costs.shape).encode())
+    digest.update(costs.tobytes())
+    return digest.hexdigest()
+
+
+def solution_key(fingerprint, start, end, solver, costs=None):
+    """Cache key of one solve: grid fingerprint, endpoints, solver name and cost hash."""
+    key = f"{fingerprint}/{start[0]},{start[1]}/{end[0]},{end[1]}/{solver}"
+    return key if costs is None else f"{key}/{costs}"
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by the total size of its values.
+
+    Thread-safe, so a background solve can fill it while the UI reads it.
+    Values larger than the whole budget are not stored.
+    """
+
+    __slots__ = ('max_bytes', 'nbytes', 'hits', 'misses', '_entries', '_lock')
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes=None):
+        """Store ``value``; ``nbytes`` defaults to its arrays' total size."""
+        if nbytes is None:
+            nbytes = _nbytes(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            self._evict()
+
+    def set_limit(self, max_bytes):
+        """Change the budget, evicting the oldest entries if it shrank."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.nbytes -= nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __repr__(self):
+        with self._lock:
+            return (f"LRUCache({len(self._entries)} entries, {self.nbytes / 2**20:.1f}"
+                    f"/{self.max_bytes / 2**20:.0f} MB, {self.hits} hits, {self.misses} misses)")
+
+
+def cached_solve(cache, grid, start, end, solver="bfs", fingerprint=None, costs=None):
+    """Solve through ``cache``; returns (path, key, hit).
+
+    Paths are stored as compact (N, 2) int32 arrays and handed back as the
+    usual list of (x, y) tuples. Pass ``fingerprint`` when the caller
+    already knows it, to skip hashing the grid again. ``costs`` only reach
+    (and only key) weighted solvers.
+    """
+    if fingerprint is None:
+        fingerprint = grid_fingerprint(grid)
+    weighted = costs is not None and solver in WEIGHTED_SOLVERS
+    key = solution_key(fingerprint, start, end, solver,
+                       cost_fingerprint(costs) if weighted else None)
+    cells = cache.get(key)
+    if cells is not None:
+        return list(zip(cells[:, 0].tolist(), cells[:, 1].tolist())), key, True
+    path = get_solver(solver, costs)(grid, start, end)
+    cache.put(key, np.asarray(path, dtype=np.int32).reshape(-1, 2))
+    return path, key, False
@@ -0,0 +1,178 @@
+"""In-place maze edits that patch the solver index and wall mesh locally.
+
+``toggle_wall`` and ``regenerate_region`` change the wall bit-planes of an
+existing grid. Given the maze's MazeTree they patch its parent pointers in
+the edited area and refresh the lifting tables with vectorized array passes,
+so a 1000x1000 maze never pays for another Python-level BFS per edit.
+
+``TiledWallMesh`` keeps the wall mesh as per-tile pieces keyed by
+``tile_fingerprint``; after an edit only the tiles whose walls changed are
+rebuilt and the single-object mesh is reassembled from the pieces.
+"""
+import numpy as np
+
+from .generators import get_generator
+from .grid import as_maze_grid
+from .mesh import build_wall_mesh, iter_tiles, tile_fingerprint
+from .tree import MazeTree
+
+DEFAULT_TILE_SIZE = 64
+
+
+def _check_cell(grid, cell):
+    x, y = cell
+    if not (0 <= x < grid.width and 0 <= y < grid.height):
+        raise ValueError(f"cell {cell} is outside the {grid.width}x{grid.height} maze")
+
+
+def wall_between(grid, a, b):
+    """(plane, index) of the wall shared by adjacent cells a and b."""
+    grid = as_maze_grid(grid)
+    _check_cell(grid, a)
+    _check_cell(grid, b)
+    (ax, ay), (bx, by) = a, b
+    if abs(ax - bx) + abs(ay - by) != 1:
+        raise ValueError(f"cells {a} and {b} are not adjacent")
+    if ax == bx:
+        return grid.horizontal, (max(ay, by), ax)
+    return grid.vertical, (ay, max(ax, bx))
+
+
+def toggle_wall(grid, a, b, tree=None):
+    """Add or knock out the wall between adjacent cells a and b.
+
+    Returns True if the wall is present afterwards. A ``tree`` index of the
+    maze is patched along (see MazeTree.update_wall).
+    """
+    plane, index = wall_between(grid, a, b)
+    present = not plane[index]
+    plane[index] = 1 if present else 0
+    if tree is not None:
+        tree.update_wall(grid, a, b)
+    return present
+
+
+def _check_region(grid, region):
+    x0, y0, x1, y1 = region
+    if not (0 <= x0 < x1 <= grid.width and 0 <= y0 < y1 <= grid.height):
+        raise ValueError(f"region {tuple(region)} is not inside the "
+                         f"{grid.width}x{grid.height} maze")
+    return x0, y0, x1, y1
+
+
+def _region_tops(tree, x0, y0, x1, y1):
+    """Flat index of every region cell and the top of its old in-region subtree."""
+    w = tree.width
+    ys, xs = np.mgrid[y0:y1, x0:x1]
+    cells = (ys * w + xs).ravel()
+    parent = tree.parent[cells]
+    px, py = parent % w, parent // w
+    inside = (px >= x0) & (px < x1) & (py >= y0) & (py < y1) & (parent != cells)
+    # Local parent inside the region, or the cell itself at a subtree top
+    local = np.arange(len(cells))
+    local[inside] = (py[inside] - y0) * (x1 - x0) + (px[inside] - x0)
+    while True:
+        nxt = local[local]
+        if np.array_equal(nxt, local):
+            break
+        local = nxt
+    return cells, np.unique(cells[local])
+
+
+def regenerate_region(grid, region, seed=None, algorithm="backtracker", tree=None):
+    """Replace the walls inside ``region`` (x0, y0, x1, y1) with a fresh sub-maze.
+
+    Works in place and returns ``grid``. A perfect maze stays perfect: the
+    region keeps one of its doors to the rest of the maze (the one nearest
+    the root of ``tree``) and every other door the old region passages made
+    redundant is closed. ``tree`` is patched along; without one it is built
+    first, which costs a full BFS. Mazes with loops keep all their doors.
+    """
+    grid = as_maze_grid(grid)
+    x0, y0, x1, y1 = _check_region(grid, region)
+    if tree is None:
+        tree = MazeTree(grid)
+    elif not tree.perfect:
+        # Only a fresh index tells a maze with loops from a perfect one the
+        # edits merely cut apart and joined again
+        tree.__init__(grid, tree.root)
+    w = grid.width
+    tile, _, _ = get_generator(algorithm)(x1 - x0, y1 - y0, seed=seed)
+
+    if not tree.perfect:
+        grid.horizontal[y0 + 1:y1, x0:x1] = tile.horizontal[1:-1]
+        grid.vertical[y0:y1, x0 + 1:x1] = tile.vertical[:, 1:-1]
+        tree.__init__(grid, tree.root)
+        return grid
+
+    # Every old in-region subtree hangs off the rest of the maze by one door
+    # (its top's parent); the new sub-maze connects them all, so only the
+    # door of the subtree closest to the root may stay open.
+    cells, tops = _region_tops(tree, x0, y0, x1, y1)
+    root = tree._index(tree.root)
+    if root in cells:
+        entry = root
+    else:
+        entry = int(tops[np.argmin(tree.depth[tops])])
+    for top in tops.tolist():
+        if top != entry:
+            door = int(tree.parent[top])
+            plane, index = wall_between(grid, (top % w, top // w), (door % w, door // w))
+            plane[index] = 1
+
+    grid.horizontal[y0 + 1:y1, x0:x1] = tile.horizontal[1:-1]
+    grid.vertical[y0:y1, x0 + 1:x1] = tile.vertical[:, 1:-1]
+
+    # Region cells now hang off the entry cell through the new sub-maze
+    rw = x1 - x0
+    sub = MazeTree(tile, root=(entry % w - x0, entry // w - y0))
+    local = sub.parent.astype(np.int64)
+    parent = ((local // rw + y0) * w + local % rw + x0).astype(np.int32)
+    keep = cells == entry
+    parent[keep] = tree.parent[entry]
+    tree.parent[cells] = parent
+    tree.refresh(grid)
+    return grid
+
+
+class TiledWallMesh:
+    """Wall mesh of a whole maze assembled from patchable per-tile pieces.
+
+    ``update`` fingerprints every tile (cheap) and rebuilds only the ones
+    whose walls, terminals or build parameters changed. Wall runs are split
+    at tile borders and corner vertices are not shared between tiles, which
+    is what lets a tile be swapped without touching its neighbours.
+    """
+
+    __slots__ = ('tile_size', 'pieces', 'rebuilt')
+
+    def __init__(self, tile_size=DEFAULT_TILE_SIZE):
+        self.tile_size = tile_size
+        self.pieces = {}
+        self.rebuilt = 0
+
+    def update(self, grid, start, end, unit_size, wall_height, offset=(0.0, 0.0, 0.0),
+               thickness=0.0):
+        """Return (vertices, faces, material_indices) for the current grid."""
+        grid = as_maze_grid(grid)
+        pieces = {}
+        self.rebuilt = 0
+        for tx, ty, region in iter_tiles(grid.width, grid.height, self.tile_size):
+            fingerprint = tile_fingerprint(grid, start, end, region, unit_size,
+                                           wall_height, thickness, offset,
+                                           grid.width, grid.height)
+            piece = self.pieces.get((tx, ty))
+            if piece is None or piece[0] != fingerprint:
+                piece = (fingerprint, *build_wall_mesh(
+                    grid, unit_size, wall_height, start, end, region=region,
+                    offset=offset, thickness=thickness))
+                self.rebuilt += 1
+            pieces[tx, ty] = piece
+        # Tiles of a larger, older maze are dropped here
+        self.pieces = pieces
+
+        shifts = np.cumsum([0] + [len(p[1]) for p in pieces.values()])[:-1]
+        vertices = np.concatenate([p[1] for p in pieces.values()])
+        faces = np.concatenate([p[2] + shift for p, shift in zip(pieces.values(), shifts)])
+        materials = np.concatenate([p[3] for p in pieces.values()])
+        return vertices, faces.astype(np.int32), materials
@@ -0,0 +1,279 @@
+"""Write maze walls straight to GLB, OBJ or STL files, no Blender needed.
+
+The walls are meshed one tile at a time (see ``iter_tiles``) and every tile
+is written out before the next one is built, so memory stays bounded by a
+single tile however large the maze is. A StreamedMaze is read one strip of
+rows at a time too, so mazes larger than RAM export without ever being
+loaded whole:
+
+* GLB: vertex and index data of all tiles go into one binary buffer; each
+  tile becomes its own node and mesh with a primitive per material. The BIN
+  chunk is spooled to a temporary file because the JSON chunk, which has to
+  come first, needs every tile's offsets.
+* OBJ: one object per tile with ``usemtl`` groups and a companion ``.mtl``.
+* STL: binary triangles; the triangle count in the header is patched once
+  all tiles are written.
+
+GLB and OBJ are written Y-up (Blender's exporter convention), STL stays
+Z-up. The maze is centered on the origin with its floor at zero.
+
+From the command line, for a maze saved with save_maze or a streamed maze
+file written by write_streamed_maze:
+
+    python -m maze_core export maze_000000.npz maze.glb --tile-size 256
+"""
+import argparse
+import json
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+from .grid import as_maze_grid
+from .mesh import build_wall_mesh, iter_tiles
+from .stream import StreamedMaze
+
+MATERIALS = (
+    ("MazeWallMat", (1.0, 1.0, 1.0)),
+    ("MazeEndMat", (1.0, 0.0, 0.0)),
+)
+
+# Rows per strip when a StreamedMaze is exported without a tile size
+STRIP_ROWS = 256
+
+# glTF constants
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+_FLOAT = 5126
+_UNSIGNED_INT = 5125
+
+
+def _tile_triangles(vertices, faces, materials):
+    """Split quads into triangles (keeping their winding), sorted by material."""
+    order = np.argsort(materials, kind="stable")
+    faces, materials = faces[order], materials[order]
+    triangles = np.empty((2 * len(faces), 3), dtype=np.uint32)
+    triangles[0::2] = faces[:, [0, 1, 2]]
+    triangles[1::2] = faces[:, [0, 2, 3]]
+    return vertices, triangles, np.repeat(materials, 2)
+
+
+def iter_mesh_tiles(grid, start, end, unit_size=1.0, wall_height=2.0, thickness=0.0,
+                    tile_size=None):
+    """Yield ``(name, vertices, triangles, material_indices)`` per non-empty tile.
+
+    Quads are split into triangles (keeping their winding) and sorted by
+    material. Without a ``tile_size`` the whole maze is one tile. ``grid``
+    may also be a StreamedMaze, which is read one strip of ``tile_size``
+    (default STRIP_ROWS) rows at a time; its tiles match those of the loaded
+    grid.
+    """
+    if isinstance(grid, StreamedMaze):
+        yield from _iter_streamed_tiles(grid, start, end, unit_size, wall_height,
+                                        thickness, tile_size)
+        return
+    grid = as_maze_grid(grid)
+    offset = (-grid.width * unit_size / 2, -grid.height * unit_size / 2, 0.0)
+    if tile_size:
+        tiles = iter_tiles(grid.width, grid.height, tile_size)
+    else:
+        tiles = [(0, 0, None)]
+    for tx, ty, region in tiles:
+        vertices, faces, materials = build_wall_mesh(
+            grid, unit_size, wall_height, start, end, region=region, offset=offset,
+            thickness=thickness)
+        if len(faces):
+            yield (f"MazeTile_{tx}_{ty}", *_tile_triangles(vertices, faces, materials))
+
+
+def _iter_streamed_tiles(maze, start, end, unit_size, wall_height, thickness, tile_size):
+    width, height = maze.width, maze.height
+    offset = (-width * unit_size / 2, -height * unit_size / 2, 0.0)
+    rows = tile_size or STRIP_ROWS
+    columns = tile_size or width
+    # One row of neighbours around each strip lets thick walls trim their ends
+    for ty, (row0, strip) in enumerate(maze.iter_strips(rows, halo=1)):
+        y0 = ty * rows
+        y1 = min(y0 + rows, height)
+        for tx, x0 in enumerate(range(0, width, columns)):
+            region = (x0, y0 - row0, min(x0 + columns, width), y1 - row0)
+            vertices, faces, materials = build_wall_mesh(
+                strip, unit_size, wall_height, start, end, region=region, offset=offset,
+                thickness=thickness, row_offset=row0, maze_height=height)
+            if len(faces):
+                yield (f"MazeTile_{tx}_{ty}", *_tile_triangles(vertices, faces, materials))
+
+
+def _y_up(vertices):
+    """Blender Z-up to glTF/OBJ Y-up: (x, y, z) -> (x, z, -y)."""
+    return np.ascontiguousarray(
+        np.stack([vertices[:, 0], vertices[:, 2], -vertices[:, 1]], axis=1),
+        dtype=np.float32)
+
+
+def write_glb(path, tiles, double_sided=True):
+    """Write tiles from iter_mesh_tiles as a binary glTF with one buffer."""
+    gltf = {
+        "asset": {"version": "2.0", "generator": "Lead Edge maze_core"},
+        "scene": 0,
+        "scenes": [{"nodes": []}],
+        "nodes": [],
+        "meshes": [],
+        "materials": [
+            {"name": name, "doubleSided": double_sided,
+             "pbrMetallicRoughness": {"baseColorFactor": [*color, 1.0],
+                                      "metallicFactor": 0.0, "roughnessFactor": 0.5}}
+            for name, color in MATERIALS
+        ],
+        "accessors": [],
+        "bufferViews": [],
+        "buffers": [],
+    }
+    accessors, views = gltf["accessors"], gltf["bufferViews"]
+
+    with tempfile.TemporaryFile() as spool:
+        length = 0
+        for name, vertices, triangles, materials in tiles:
+            positions = _y_up(vertices)
+            # float32 and uint32 data keeps every view 4-byte aligned
+            for data, target in ((positions, _ARRAY_BUFFER),
+                                 (triangles, _ELEMENT_ARRAY_BUFFER)):
+                raw = data.tobytes()
+                views.append({"buffer": 0, "byteOffset": length,
+                              "byteLength": len(raw), "target": target})
+                spool.write(raw)
+                length += len(raw)
+
+            accessors.append({"bufferView": len(views) - 2, "componentType": _FLOAT,
+                              "count": len(positions), "type": "VEC3",
+                              "min": positions.min(axis=0).tolist(),
+                              "max": positions.max(axis=0).tolist()})
+            position_accessor = len(accessors) - 1
+            primitives = []
+            bounds = np.searchsorted(materials, np.arange(len(MATERIALS) + 1))
+            for material, (first, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+                if first == stop:
+                    continue
+                accessors.append({"bufferView": len(views) - 1,
+                                  "byteOffset": int(first) * 12,
+                                  "componentType": _UNSIGNED_INT,
+                                  "count": int(stop - first) * 3, "type": "SCALAR"})
+                primitives.append({"attributes": {"POSITION": position_accessor},
+                                   "indices": len(accessors) - 1,
+                                   "material": material})
+            gltf["meshes"].append({"name": name, "primitives": primitives})
+            gltf["nodes"].append({"name": name, "mesh": len(gltf["meshes"]) - 1})
+            gltf["scenes"][0]["nodes"].append(len(gltf["nodes"]) - 1)
+
+        gltf["buffers"].append({"byteLength": length})
+        header = json.dumps(gltf, separators=(",", ":")).encode()
+        header += b" " * (-len(header) % 4)
+        bin_length = length + (-length % 4)
+        with open(path, "wb") as f:
+            f.write(struct.pack("<4sII", b"glTF", 2,
+                                12 + 8 + len(header) + 8 + bin_length))
+            f.write(struct.pack("<I4s", len(header), b"JSON"))
+            f.write(header)
+            f.write(struct.pack("<I4s", bin_length, b"BIN\0"))
+            spool.seek(0)
+            shutil.copyfileobj(spool, f)
+            f.write(b"\0" * (bin_length - length))
+
+
+def write_obj(path, tiles):
+    """Write tiles as Wavefront OBJ plus a ``.mtl`` file next to it."""
+    mtl_path = os.path.splitext(path)[0] + ".mtl"
+    with open(mtl_path, "w") as f:
+        for name, color in MATERIALS:
+            f.write(f"newmtl {name}\nKd {color[0]:g} {color[1]:g} {color[2]:g}\n\n")
+
+    with open(path, "w") as f:
+        f.write(f"mtllib {os.path.basename(mtl_path)}\n")
+        base = 1
+        for name, vertices, triangles, materials in tiles:
+            f.write(f"o {name}\n")
+            np.savetxt(f, _y_up(vertices), fmt="v %.6f %.6f %.6f")
+            bounds = np.searchsorted(materials, np.arange(len(MATERIALS) + 1))
+            for material, (first, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+                if first == stop:
+                    continue
+                f.write(f"usemtl {MATERIALS[material][0]}\n")
+                np.savetxt(f, triangles[first:stop].astype(np.int64) + base,
+                           fmt="f %d %d %d")
+            base += len(vertices)
+
+
+_STL_TRIANGLE = np.dtype([("normal", "<f4", 3), ("vertices", "<f4", (3, 3)),
+                          ("attribute", "<u2")])
+
+
+def write_stl(path, tiles):
+    """Write tiles as one binary STL (Z-up)."""
+    count = 0
+    with open(path, "wb") as f:
+        f.write(b"Lead Edge maze".ljust(80, b"\0"))
+        f.write(struct.pack("<I", 0))
+        for _, vertices, triangles, _ in tiles:
+            corners = vertices[triangles]
+            normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+            normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+            records = np.zeros(len(triangles), dtype=_STL_TRIANGLE)
+            records["normal"] = normals
+            records["vertices"] = corners
+            f.write(records.tobytes())
+            count += len(triangles)
+        f.seek(80)
+        f.write(struct.pack("<I", count))
+
+
+WRITERS = {
+    ".glb": write_glb,
+    ".obj": write_obj,
+    ".stl": write_stl,
+}
+
+
+def export_maze(path, grid, start, end, unit_size=1.0, wall_height=2.0, thickness=0.0,
+                tile_size=None):
+    """Mesh the maze walls and write them to ``path`` (.glb, .obj or .stl).
+
+    ``grid`` may be a StreamedMaze; see iter_mesh_tiles.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"unsupported export format {ext!r}; use one of {', '.join(WRITERS)}")
+    tiles = iter_mesh_tiles(grid, start, end, unit_size, wall_height, thickness, tile_size)
+    if ext == ".glb":
+        # Single-sided wall panels must render from both sides
+        write_glb(path, tiles, double_sided=thickness <= 0)
+    else:
+        WRITERS[ext](path, tiles)
+
+
+def main(argv=None):
+    from .storage import load_maze
+
+    parser = argparse.ArgumentParser(
+        prog="python -m maze_core export",
+        description="Export a maze saved with save_maze as GLB, OBJ or STL.")
+    parser.add_argument("maze", help=".npz file written by save_maze, or a streamed "
+                                     "maze file written by write_streamed_maze")
+    parser.add_argument("out", help="output file; the format follows the extension")
+    parser.add_argument("--unit-size", type=float, default=1.0)
+    parser.add_argument("--wall-height", type=float, default=2.0)
+    parser.add_argument("--thickness", type=float, default=0.0,
+                        help="build closed box walls this thick (0 = panels)")
+    parser.add_argument("--tile-size", type=int, default=None,
+                        help="mesh and write this many cells per side at a time")
+    args = parser.parse_args(argv)
+
+    if args.maze.endswith(".npz"):
+        grid, start, end = load_maze(args.maze)[:3]
+    else:
+        # Streamed mazes are meshed strip by strip, never loaded whole
+        grid = StreamedMaze(args.maze)
+        start, end = grid.start, grid.end
+    export_maze(args.out, grid, start, end, args.unit_size, args.wall_height,
+                args.thickness, args.tile_size)
@@ -0,0 +1,131 @@
+"""Recursive-backtracker maze generation on a MazeGrid."""
+import random
+
+import numpy as np
+
+from .grid import MazeGrid
+from .rng import make_rng
+
+# random.choice over these draws an index exactly like choosing from a list
+# of that many neighbors, without building the list
+_CHOICES = (None, range(1), range(2), range(3), range(4))
+
+
+def get_random_perimeter_cell(width, height, exclude_cell=None, rng=None):
+    """Return a random (x,y) on the outer edge of the grid.
+
+    Uses the global ``random`` module unless a BlockRandom is given.
+    """
+    perimeter = []
+    for x in range(width):
+        perimeter.append((x, 0))
+        perimeter.append((x, height - 1))
+    for y in range(1, height - 1):
+        perimeter.append((0, y))
+        perimeter.append((width - 1, y))
+    if exclude_cell and exclude_cell in perimeter:
+        perimeter.remove(exclude_cell)
+    return (rng or random).choice(perimeter)
+
+
+def create_grid(width, height):
+    """Initialize a bit-packed grid of cells, each with four walls."""
+    return MazeGrid(width, height)
+
+
+def remove_wall(x1, y1, x2, y2, grid):
+    """Remove the wall between two adjacent cells."""
+    grid.remove_wall(x1, y1, x2, y2)
+
+
+def generate_maze(width, height, rng=None):
+    """Generate the maze grid, plus random start and end on the perimeter.
+
+    Recursive backtracker with a lean memory layout: the stack keeps only
+    the direction (0-3) of each move in a bytearray, visited cells live in a
+    bitset and the walls are carved into flat bytearrays.
+
+    ``rng`` may be an int seed, a ``numpy.random.Generator`` or a
+    BlockRandom, and the same seed always rebuilds the same maze. Without it
+    neighbors are drawn with the same global random.choice calls as the old
+    tuple/list version, so a given ``random.seed`` still yields the same maze.
+    """
+    if rng is not None:
+        rng = make_rng(rng)
+    start = get_random_perimeter_cell(width, height, rng=rng)
+    end   = get_random_perimeter_cell(width, height, exclude_cell=start, rng=rng)
+
+    horizontal = bytearray(b'\x01') * ((height + 1) * width)
+    vertical   = bytearray(b'\x01') * (height * (width + 1))
+    visited    = bytearray((width * height + 7) >> 3)
+    stack      = bytearray()
+    choice     = random.choice
+    if rng is not None:
+        # Read the prefetched block inline instead of a call per step
+        block, pos = rng.take_block()
+
+    x, y = start
+    i = y * width + x
+    visited[i >> 3] |= 1 << (i & 7)
+    while True:
+        # Unvisited neighbors in the historical order: left, right, up, down
+        left  = x > 0 and not visited[(i - 1) >> 3] >> ((i - 1) & 7) & 1
+        right = x < width - 1 and not visited[(i + 1) >> 3] >> ((i + 1) & 7) & 1
+        up    = y > 0 and not visited[(i - width) >> 3] >> ((i - width) & 7) & 1
+        down  = y < height - 1 and not visited[(i + width) >> 3] >> ((i + width) & 7) & 1
+        count = left + right + up + down
+        if count:
+            if rng is None:
+                pick = choice(_CHOICES[count])
+            else:
+                if pos == len(block):
+                    block, pos = rng.take_block()
+                pick = (block[pos] * count) >> 32
+                pos += 1
+            if left:
+                if not pick:
+                    vertical[y * (width + 1) + x] = 0
+                    x -= 1; i -= 1
+                    stack.append(0)
+                    visited[i >> 3] |= 1 << (i & 7)
+                    continue
+                pick -= 1
+            if right:
+                if not pick:
+                    x += 1; i += 1
+                    vertical[y * (width + 1) + x] = 0
+                    stack.append(1)
+                    visited[i >> 3] |= 1 << (i & 7)
+                    continue
+                pick -= 1
+            if up:
+                if not pick:
+                    horizontal[i] = 0
+                    y -= 1; i -= width
+                    stack.append(2)
+                    visited[i >> 3] |= 1 << (i & 7)
+                    continue
+            y += 1; i += width
+            horizontal[i] = 0
+            stack.append(3)
+            visited[i >> 3] |= 1 << (i & 7)
+        elif stack:
+            # Step back against the direction we arrived from
+            move = stack.pop()
+            if move == 0:
+                x += 1; i += 1
+            elif move == 1:
+                x -= 1; i -= 1
+            elif move == 2:
+                y += 1; i += width
+            else:
+                y -= 1; i -= width
+        else:
+            break
+    if rng is not None:
+        rng.give_back(block, pos)
+
+    grid = MazeGrid(width, height,
+                    np.frombuffer(horizontal, dtype=np.uint8).reshape(height + 1, width),
+                    np.frombuffer(vertical, dtype=np.uint8).reshape(height, width + 1))
+    return grid, start, end
@@ -0,0 +1,248 @@
+"""Pluggable maze generator registry with vectorized NumPy algorithms.
+
+Every generator takes ``(width, height, seed=None)`` and returns the same
+``(grid, start, end)`` triple as ``generate_maze``. Register new ones with
+``@register_generator("name")`` and look them up with ``get_generator``.
+
+Binary tree and sidewinder only ever decide locally, so a whole grid is
+carved with a handful of array operations. The tiled mode builds an
+independent sub-maze per tile and stitches the tiles together through a
+random spanning tree over the tile graph, which keeps the result perfect.
+
+``braid_maze`` turns any of them into a braided maze with loops by opening
+an extra wall at a fraction of the dead ends, and ``cost_plane`` gives a maze
+per-cell step costs for solve_dijkstra. ``maze_seeds`` splits one maze seed
+into independent seeds for the three.
+"""
+import numpy as np
+
+from .generate import generate_maze
+from .grid import MazeGrid, TOP, RIGHT, BOTTOM, LEFT
+from .stream import random_perimeter_cell
+
+GENERATORS = {}
+
+
+def register_generator(name):
+    """Decorator adding a ``(width, height, seed=None)`` generator to GENERATORS."""
+    def decorator(func):
+        GENERATORS[name] = func
+        return func
+    return decorator
+
+
+def get_generator(name):
+    try:
+        return GENERATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown maze generator {name!r}; "
+                         f"choose from {', '.join(sorted(GENERATORS))}") from None
+
+
+def _coin_flips(rng, shape):
+    """Boolean array of fair coin flips, drawn as packed random bytes."""
+    count = int(np.prod(shape))
+    packed = rng.integers(0, 256, size=(count + 7) // 8, dtype=np.uint8)
+    return np.unpackbits(packed, count=count).reshape(shape).view(bool)
+
+
+def _random_below(rng, highs):
+    """Uniform random integers in [0, highs) for an array of bounds."""
+    draws = rng.integers(0, 2**32, size=len(highs), dtype=np.uint64)
+    return (draws * highs.astype(np.uint64)) >> np.uint64(32)
+
+
+def _terminals(width, height, rng):
+    start = random_perimeter_cell(width, height, rng)
+    end = random_perimeter_cell(width, height, rng, exclude_cell=start)
+    return start, end
+
+
+@register_generator("backtracker")
+def backtracker(width, height, seed=None):
+    """The original recursive backtracker (long winding corridors)."""
+    return generate_maze(width, height, rng=seed)
+
+
+def _binary_tree_planes(width, height, rng):
+    """Carve north or west from every cell except the top-left corner."""
+    grid = MazeGrid(width, height)
+    north = _coin_flips(rng, (height, width))
+    north[0, :] = False
+    north[:, 0] = True
+    north[0, 0] = False
+    west = ~north
+    west[:, 0] = False
+    grid.horizontal[:-1][north] = 0
+    grid.vertical[:, :-1][west] = 0
+    return grid
+
+
+@register_generator("binary_tree")
+def binary_tree(width, height, seed=None):
+    """Binary tree maze: every cell opens north or west (diagonal bias)."""
+    rng = np.random.default_rng(seed)
+    grid = _binary_tree_planes(width, height, rng)
+    return (grid, *_terminals(width, height, rng))
+
+
+def _sidewinder_planes(width, height, rng):
+    """Sidewinder: east-going runs, each closed by one random passage north."""
+    grid = MazeGrid(width, height)
+    grid.vertical[0, 1:-1] = 0
+    if height == 1:
+        return grid
+
+    east = _coin_flips(rng, (height - 1, width - 1))
+    grid.vertical[1:, 1:-1][east] = 0
+
+    # A run starts at column 0 and wherever the previous cell did not go east
+    starts = np.ones((height - 1, width), dtype=bool)
+    starts[:, 1:] = ~east
+    flat_starts = np.flatnonzero(starts)
+    lengths = np.diff(np.append(flat_starts, starts.size))
+    chosen = flat_starts + _random_below(rng, lengths).astype(np.int64)
+    rows, cols = np.divmod(chosen, width)
+    grid.horizontal[rows + 1, cols] = 0
+    return grid
+
+
+@register_generator("sidewinder")
+def sidewinder(width, height, seed=None):
+    """Sidewinder maze: open top corridor, horizontal runs below it."""
+    rng = np.random.default_rng(seed)
+    grid = _sidewinder_planes(width, height, rng)
+    return (grid, *_terminals(width, height, rng))
+
+
+def _spanning_tree(cols, rows, rng):
+    """Random spanning tree over a cols x rows tile graph (Kruskal)."""
+    edges = [((tx, ty), (tx + 1, ty)) for ty in range(rows) for tx in range(cols - 1)]
+    edges += [((tx, ty), (tx, ty + 1)) for ty in range(rows - 1) for tx in range(cols)]
+    parent = list(range(cols * rows))
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    tree = []
+    for i in rng.permutation(len(edges)).tolist():
+        (ax, ay), (bx, by) = edges[i]
+        a, b = find(ay * cols + ax), find(by * cols + bx)
+        if a != b:
+            parent[b] = a
+            tree.append(edges[i])
+    return tree
+
+
+def generate_tiled(width, height, seed=None, tile_size=256, inner="sidewinder"):
+    """Independent ``inner`` sub-mazes per tile, stitched by a tile spanning tree."""
+    rng = np.random.default_rng(seed)
+    inner_gen = get_generator(inner)
+    grid = MazeGrid(width, height)
+    cols = -(-width // tile_size)
+    rows = -(-height // tile_size)
+
+    for ty in range(rows):
+        y0, y1 = ty * tile_size, min((ty + 1) * tile_size, height)
+        for tx in range(cols):
+            x0, x1 = tx * tile_size, min((tx + 1) * tile_size, width)
+            tile, _, _ = inner_gen(x1 - x0, y1 - y0, seed=int(rng.integers(2**63)))
+            grid.horizontal[y0 + 1:y1, x0:x1] = tile.horizontal[1:-1]
+            grid.vertical[y0:y1, x0 + 1:x1] = tile.vertical[:, 1:-1]
+
+    # One random door on the shared border of every spanning-tree edge
+    for (ax, ay), (bx, by) in _spanning_tree(cols, rows, rng):
+        if ay == by:
+            y0, y1 = ay * tile_size, min((ay + 1) * tile_size, height)
+            grid.vertical[int(rng.integers(y0, y1)), bx * tile_size] = 0
+        else:
+            x0, x1 = ax * tile_size, min((ax + 1) * tile_size, width)
+            grid.horizontal[by * tile_size, int(rng.integers(x0, x1))] = 0
+    return (grid, *_terminals(width, height, rng))
+
+
+@register_generator("tiled")
+def tiled(width, height, seed=None):
+    """Sidewinder tiles of 256x256 stitched into one perfect maze."""
+    return generate_tiled(width, height, seed)
+
+
+def braid_maze(grid, fraction, seed=None):
+    """Open one more wall at ``fraction`` of the dead ends, adding loops.
+
+    Every chosen dead end loses a random interior wall, preferring one into
+    another dead end so a single opening fixes both. Works in place on
+    ``grid`` and returns it; the border is never opened.
+    """
+    if not 0.0 <= fraction <= 1.0:
+        raise ValueError(f"braid fraction must be in [0, 1], got {fraction}")
+    rng = np.random.default_rng(seed)
+    h, w = grid.height, grid.width
+    degree = grid.degrees()
+    ys, xs = np.nonzero(degree <= 1)
+    chosen = rng.choice(len(ys), size=int(round(fraction * len(ys))), replace=False)
+    ys, xs = ys[chosen], xs[chosen]
+    if not len(ys):
+        return grid
+
+    closed = grid.cell_masks()[ys, xs]
+    padded = np.full((h + 2, w + 2), 99, dtype=np.int32)
+    padded[1:-1, 1:-1] = degree
+    sides = (
+        (TOP, ys > 0, padded[ys, xs + 1]),
+        (RIGHT, xs < w - 1, padded[ys + 1, xs + 2]),
+        (BOTTOM, ys < h - 1, padded[ys + 2, xs + 1]),
+        (LEFT, xs > 0, padded[ys + 1, xs]),
+    )
+    # Random score per candidate wall, +1 when it leads into another dead end
+    scores = np.full((4, len(ys)), -1.0)
+    for k, (bit, inside, neighbor_degree) in enumerate(sides):
+        usable = inside & (closed & bit != 0)
+        scores[k] = np.where(usable, rng.random(len(ys)) + (neighbor_degree <= 1), -1.0)
+    side = scores.argmax(axis=0)
+    ok = scores.max(axis=0) >= 0
+
+    for k, plane, dy, dx in ((0, grid.horizontal, 0, 0), (1, grid.vertical, 0, 1),
+                             (2, grid.horizontal, 1, 0), (3, grid.vertical, 0, 0)):
+        sel = ok & (side == k)
+        plane[ys[sel] + dy, xs[sel] + dx] = 0
+    return grid
+
+
+def maze_seeds(seed):
+    """Seeds for the generator, braid_maze and cost_plane of the maze ``seed`` names.
+
+    The generator keeps ``seed`` itself, so a seed carves the same maze as
+    ever; braiding and costs draw from SeedSequence children, whose streams
+    are independent of the carving order and of each other.
+    """
+    if seed is None:
+        return None, None, None
+    braid, costs = np.random.SeedSequence(seed).spawn(2)
+    return seed, braid, costs
+
+
+def cost_plane(width, height, roughness=4.0, seed=None, scale=8):
+    """Per-cell step costs for solve_dijkstra: rolling terrain from 1 to 1 + roughness.
+
+    Random heights on a coarse lattice every ``scale`` cells are bilinearly
+    interpolated, so cheap and expensive cells come in patches a weighted
+    route can detour around. Returns a (height, width) float32 array.
+    """
+    if roughness < 0:
+        raise ValueError(f"roughness must be non-negative, got {roughness}")
+    rng = np.random.default_rng(seed)
+    coarse = rng.random((height // scale + 2, width // scale + 2))
+    ys = np.arange(height) / scale
+    xs = np.arange(width) / scale
+    y0 = ys.astype(np.int64)
+    x0 = xs.astype(np.int64)
+    fy = (ys - y0)[:, None]
+    fx = (xs - x0)[None, :]
+    upper, lower = coarse[y0], coarse[y0 + 1]
+    top = upper[:, x0] * (1 - fx) + upper[:, x0 + 1] * fx
+    bottom = lower[:, x0] * (1 - fx) + lower[:, x0 + 1] * fx
+    return (1.0 + roughness * (top * (1 - fy) + bottom * fy)).astype(np.float32)
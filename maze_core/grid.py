@@ -0,0 +1,174 @@
+"""Compact wall storage for Lead Edge mazes.
+
+Neighbouring cells share their walls, so instead of four booleans per cell the
+grid keeps two uint8 bit-planes:
+
+* ``horizontal[y, x]`` is the wall along the top edge of cell (x, y); row
+  ``height`` is the bottom border of the maze.
+* ``vertical[y, x]`` is the wall along the left edge of cell (x, y); column
+  ``width`` is the right border of the maze.
+
+A 2000x2000 maze takes ~8 MB this way instead of millions of dicts.
+"""
+import numpy as np
+
+SIDES = ('top', 'right', 'bottom', 'left')
+
+# Bits of the 4-bit per-cell wall mask returned by MazeGrid.cell_masks()
+TOP, RIGHT, BOTTOM, LEFT = 1, 2, 4, 8
+SIDE_BITS = {'top': TOP, 'right': RIGHT, 'bottom': BOTTOM, 'left': LEFT}
+
+# Neighbor offset reached by walking through each side
+OFFSETS = {
+    'top':    (0, -1),
+    'right':  (1,  0),
+    'bottom': (0,  1),
+    'left':   (-1, 0),
+}
+
+
+class MazeGrid:
+    """Two shared-wall bit-planes describing a width x height maze."""
+
+    __slots__ = ('width', 'height', 'horizontal', 'vertical')
+
+    def __init__(self, width, height, horizontal=None, vertical=None):
+        if width < 1 or height < 1:
+            raise ValueError(f"Maze must be at least 1x1, got {width}x{height}")
+        self.width = width
+        self.height = height
+        if horizontal is None:
+            horizontal = np.ones((height + 1, width), dtype=np.uint8)
+        if vertical is None:
+            vertical = np.ones((height, width + 1), dtype=np.uint8)
+        if horizontal.shape != (height + 1, width) or vertical.shape != (height, width + 1):
+            raise ValueError("Wall planes do not match the grid size")
+        self.horizontal = horizontal
+        self.vertical = vertical
+
+    # -------------------------------------------------------------------------
+    # Per-wall access
+    # -------------------------------------------------------------------------
+    def _plane_index(self, x, y, side):
+        if side == 'top':
+            return self.horizontal, (y, x)
+        if side == 'bottom':
+            return self.horizontal, (y + 1, x)
+        if side == 'left':
+            return self.vertical, (y, x)
+        if side == 'right':
+            return self.vertical, (y, x + 1)
+        raise KeyError(side)
+
+    def has_wall(self, x, y, side):
+        """True if cell (x, y) has a wall on the given side."""
+        plane, idx = self._plane_index(x, y, side)
+        return bool(plane[idx])
+
+    def set_wall(self, x, y, side, present=True):
+        """Add or remove the wall on one side of a cell (shared with its neighbor)."""
+        plane, idx = self._plane_index(x, y, side)
+        plane[idx] = 1 if present else 0
+
+    def remove_wall(self, x1, y1, x2, y2):
+        """Remove the wall between two adjacent cells."""
+        if x1 == x2:
+            self.horizontal[max(y1, y2), x1] = 0
+        else:
+            self.vertical[y1, max(x1, x2)] = 0
+
+    def open_neighbors(self, x, y):
+        """Cells reachable from (x, y) in a single step."""
+        neighbors = []
+        if y > 0 and not self.horizontal[y, x]:
+            neighbors.append((x, y - 1))
+        if x < self.width - 1 and not self.vertical[y, x + 1]:
+            neighbors.append((x + 1, y))
+        if y < self.height - 1 and not self.horizontal[y + 1, x]:
+            neighbors.append((x, y + 1))
+        if x > 0 and not self.vertical[y, x]:
+            neighbors.append((x - 1, y))
+        return neighbors
+
+    # -------------------------------------------------------------------------
+    # Whole-grid views
+    # -------------------------------------------------------------------------
+    def cell_masks(self):
+        """(height, width) uint8 array of 4-bit wall masks (TOP|RIGHT|BOTTOM|LEFT)."""
+        return (self.horizontal[:-1] * TOP
+                | self.vertical[:, 1:] * RIGHT
+                | self.horizontal[1:] * BOTTOM
+                | self.vertical[:, :-1] * LEFT).astype(np.uint8)
+
+    def passage_masks(self):
+        """(height, width) uint8 array of 4-bit masks of the *open* sides.
+
+        Openings in the outer border are ignored, so every set bit leads to a
+        cell inside the grid.
+        """
+        masks = ~self.cell_masks() & 0xF
+        masks[0, :] &= ~TOP & 0xF
+        masks[-1, :] &= ~BOTTOM & 0xF
+        masks[:, 0] &= ~LEFT & 0xF
+        masks[:, -1] &= ~RIGHT & 0xF
+        return masks
+
+    def degrees(self):
+        """(height, width) array with the number of open passages of every cell."""
+        deg = np.zeros((self.height, self.width), dtype=np.int32)
+        open_h = self.horizontal[1:-1] == 0
+        open_v = self.vertical[:, 1:-1] == 0
+        deg[:-1] += open_h
+        deg[1:] += open_h
+        deg[:, :-1] += open_v
+        deg[:, 1:] += open_v
+        return deg
+
+    def copy(self):
+        return MazeGrid(self.width, self.height,
+                        self.horizontal.copy(), self.vertical.copy())
+
+    def __eq__(self, other):
+        if not isinstance(other, MazeGrid):
+            return NotImplemented
+        return (self.width == other.width and self.height == other.height
+                and np.array_equal(self.horizontal, other.horizontal)
+                and np.array_equal(self.vertical, other.vertical))
+
+    def __repr__(self):
+        return f"MazeGrid({self.width}x{self.height})"
+
+
+# -----------------------------------------------------------------------------
+# Legacy list-of-dicts adapter
+# -----------------------------------------------------------------------------
+def to_cell_dicts(grid):
+    """Expand a MazeGrid into the old ``grid[y][x]['top']`` list-of-dicts form."""
+    masks = grid.cell_masks().tolist()
+    return [[{side: bool(m & SIDE_BITS[side]) for side in SIDES} for m in row]
+            for row in masks]
+
+
+def from_cell_dicts(cells):
+    """Pack an old list-of-dicts grid into a MazeGrid.
+
+    Each shared wall is kept if either neighbor still reports it.
+    """
+    height = len(cells)
+    width = len(cells[0])
+    grid = MazeGrid(width, height,
+                    np.zeros((height + 1, width), dtype=np.uint8),
+                    np.zeros((height, width + 1), dtype=np.uint8))
+    for y, row in enumerate(cells):
+        for x, cell in enumerate(row):
+            for side in SIDES:
+                if cell[side]:
+                    grid.set_wall(x, y, side)
+    return grid
+
+
+def as_maze_grid(grid):
+    """Accept either a MazeGrid or a legacy list-of-dicts grid."""
+    if isinstance(grid, MazeGrid):
+        return grid
+    return from_cell_dicts(grid)
@@ -0,0 +1,363 @@
+"""Vectorized wall-mesh construction for Lead Edge mazes.
+
+The mesh is built straight from the wall bit-planes in two stages:
+
+1. ``extract_wall_runs`` walks each plane once, so every physical wall is
+   emitted exactly once, and merges unbroken collinear walls into runs.
+2. ``build_wall_mesh`` turns every run into one quad between two lattice
+   corners; each corner contributes one floor and one top vertex that all of
+   its runs share.
+
+The result is plain NumPy arrays that Blender can load with ``foreach_set``
+and that need no welding. Every quad is wound so its normal faces away from
+the middle of the maze, so no normal recalculation is needed either.
+
+Both stages accept a ``region`` of cells ``(x0, y0, x1, y1)`` so giant mazes
+can be meshed tile by tile (see ``iter_tiles``). A region owns the walls on
+its top and left edges plus its interior walls; the bottom and right edges
+belong to the next tile, except along the outer border of the maze. That way
+every wall ends up in exactly one tile.
+
+They also accept a window of rows cut from a taller maze, such as the strips
+``StreamedMaze.iter_strips`` reads: ``row_offset`` is the window's first row
+and ``maze_height`` the height of the whole maze, so terminals, ownership of
+the bottom border and wall facing are decided for the whole maze while only
+the window is in memory.
+"""
+import hashlib
+
+import numpy as np
+
+from .grid import as_maze_grid
+
+# Bumped whenever the mesh layout changes, so cached tiles get rebuilt
+MESH_VERSION = 2
+
+
+def perimeter_side(cell, width, height):
+    """Which outer side of a perimeter cell carries its entry/exit wall."""
+    x, y = cell
+    if y == 0:
+        return 'top'
+    if y == height - 1:
+        return 'bottom'
+    if x == 0:
+        return 'left'
+    return 'right'
+
+
+def _terminal_walls(width, height, cells):
+    """``(horizontal?, row, col)`` plane index of each terminal cell's outer wall."""
+    walls = []
+    for x, y in cells:
+        side = perimeter_side((x, y), width, height)
+        if side == 'top':
+            walls.append((True, y, x))
+        elif side == 'bottom':
+            walls.append((True, y + 1, x))
+        elif side == 'left':
+            walls.append((False, y, x))
+        else:
+            walls.append((False, y, x + 1))
+    return walls
+
+
+def iter_tiles(width, height, tile_size):
+    """Yield ``(tx, ty, (x0, y0, x1, y1))`` for square tiles covering the grid."""
+    for ty, y0 in enumerate(range(0, height, tile_size)):
+        for tx, x0 in enumerate(range(0, width, tile_size)):
+            yield tx, ty, (x0, y0, min(x0 + tile_size, width), min(y0 + tile_size, height))
+
+
+def _region_planes(grid, region, bottom=None):
+    """Slices of both planes owned by a region, plus the region's corner.
+
+    ``bottom`` is the row of the maze's bottom border in grid rows (default:
+    the grid's own); only a region ending there owns that border.
+    """
+    if region is None:
+        return grid.horizontal, grid.vertical, 0, 0
+    x0, y0, x1, y1 = region
+    h_stop = y1 + 1 if y1 == (grid.height if bottom is None else bottom) else y1
+    v_stop = x1 + 1 if x1 == grid.width else x1
+    return (grid.horizontal[y0:h_stop, x0:x1],
+            grid.vertical[y0:y1, x0:v_stop], x0, y0)
+
+
+def _row_runs(plane, merge):
+    """(row, first, stop) for every run of set bits along the rows of a plane."""
+    if not merge:
+        rows, cols = np.nonzero(plane)
+        return rows, cols, cols + 1
+    padded = np.zeros((plane.shape[0], plane.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = plane
+    edges = np.diff(padded, axis=1)
+    rows, first = np.nonzero(edges == 1)
+    _, stop = np.nonzero(edges == -1)
+    return rows, first, stop
+
+
+def extract_wall_runs(grid, start, end, merge=True, region=None, row_offset=0,
+                      maze_height=None):
+    """Return every physical wall once as an (R, 5) int32 array of runs.
+
+    Each row is ``(x0, y0, x1, y1, material)`` in lattice-corner coordinates;
+    horizontal runs have ``y0 == y1`` and vertical runs ``x0 == x1``. With
+    ``merge`` set, unbroken collinear walls collapse into a single run. The
+    entry/exit walls always stay single-segment runs with material 1.
+
+    For a window of a taller maze, ``region`` is in window rows while
+    ``start``/``end`` and the returned runs are in maze coordinates.
+    """
+    grid = as_maze_grid(grid)
+    if maze_height is None:
+        maze_height = grid.height + row_offset
+    elif region is None:
+        region = (0, 0, grid.width, grid.height)
+    horizontal, vertical, ox, oy = _region_planes(grid, region, maze_height - row_offset)
+    red_h = np.zeros_like(horizontal)
+    red_v = np.zeros_like(vertical)
+    for is_h, row, col in _terminal_walls(grid.width, maze_height, (start, end)):
+        red = red_h if is_h else red_v
+        r, c = row - oy - row_offset, col - ox
+        if 0 <= r < red.shape[0] and 0 <= c < red.shape[1]:
+            red[r, c] = 1
+
+    oy += row_offset
+    runs = []
+    for plane, red, is_v in ((horizontal, red_h, False), (vertical, red_v, True)):
+        for bits, material in ((plane & (red ^ 1), 0), (plane & red, 1)):
+            # Vertical walls run down the columns, so scan the transpose
+            lines, first, stop = _row_runs(bits.T if is_v else bits,
+                                           merge and material == 0)
+            block = np.empty((len(lines), 5), dtype=np.int32)
+            if is_v:
+                block[:, 0] = lines + ox
+                block[:, 1] = first + oy
+                block[:, 2] = lines + ox
+                block[:, 3] = stop + oy
+            else:
+                block[:, 0] = first + ox
+                block[:, 1] = lines + oy
+                block[:, 2] = stop + ox
+                block[:, 3] = lines + oy
+            block[:, 4] = material
+            runs.append(block)
+    return np.concatenate(runs)
+
+
+def runs_to_mesh(runs, unit_size, wall_height, offset=(0.0, 0.0, 0.0), facing=None):
+    """Turn wall runs into (vertices, faces, material_indices) arrays.
+
+    Every run becomes one quad; the floor and top vertex of each lattice
+    corner are shared by all runs ending there. ``offset`` is added to every
+    vertex. Quads face -Y (horizontal walls) or +X (vertical walls); with a
+    ``facing`` point ``(x, y)`` in cell units they face away from it instead.
+    """
+    # Any stride wider than the largest x keeps corner ids unique
+    stride = int(runs[:, [0, 2]].max()) + 2 if len(runs) else 1
+    corner_a = runs[:, 1].astype(np.int64) * stride + runs[:, 0]
+    corner_b = runs[:, 3].astype(np.int64) * stride + runs[:, 2]
+
+    # Keep only the lattice corners touched by a wall and renumber them
+    used = np.unique(np.concatenate([corner_a, corner_b]))
+    n = len(used)
+    a = np.searchsorted(used, corner_a).astype(np.int32)
+    b = np.searchsorted(used, corner_b).astype(np.int32)
+
+    vertices = np.empty((2 * n, 3), dtype=np.float32)
+    vertices[:n, 0] = (used % stride) * unit_size + offset[0]
+    vertices[:n, 1] = (used // stride) * unit_size + offset[1]
+    vertices[:n, 2] = offset[2]
+    vertices[n:, :2] = vertices[:n, :2]
+    vertices[n:, 2] = wall_height + offset[2]
+
+    if facing is not None:
+        # Swapping a run's ends flips its quad's normal
+        horizontal = runs[:, 1] == runs[:, 3]
+        flip = np.where(horizontal, runs[:, 1] > facing[1], runs[:, 0] < facing[0])
+        a, b = np.where(flip, b, a), np.where(flip, a, b)
+
+    faces = np.stack([a, b, b + n, a + n], axis=1)
+    return vertices, faces, runs[:, 4].copy()
+
+
+# Box corners (bottom then top ring, counter-clockwise from above) and the six
+# outward-facing quads over them
+_BOX_FACES = np.array([(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+                       (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)], dtype=np.int32)
+
+
+def _split_at_posts(runs, covered):
+    """Split vertical runs at every corner post owned by a horizontal wall."""
+    vertical = runs[:, 0] == runs[:, 2]
+    vr = runs[vertical]
+    lengths = vr[:, 3] - vr[:, 1]
+    owner = np.repeat(np.arange(len(vr)), lengths)
+    firsts = np.cumsum(lengths) - lengths
+    ys = vr[owner, 1] + np.arange(len(owner)) - np.repeat(firsts, lengths)
+    xs = vr[owner, 0]
+    # A piece starts at the first wall of each run and after every post
+    starts = covered[ys, xs]
+    starts[firsts] = True
+    first = np.flatnonzero(starts)
+    last = np.append(first[1:], len(owner))[:len(first)] - 1
+    pieces = np.stack([xs[first], ys[first], xs[first], ys[last] + 1,
+                       vr[owner[first], 4]], axis=1).astype(runs.dtype)
+    return np.concatenate([runs[~vertical], pieces])
+
+
+def runs_to_box_mesh(grid, runs, unit_size, wall_height, thickness,
+                     offset=(0.0, 0.0, 0.0), row_offset=0):
+    """Turn wall runs into closed boxes ``thickness`` wide, centered on the walls.
+
+    Horizontal runs own the square post at every lattice corner they touch
+    and stop flush where another horizontal wall carries on. Vertical runs
+    are split at such posts and stop at their sides, flush against a
+    following vertical wall, or else run on over their own open end. So no
+    two boxes overlap and corners join without gaps. Coincident corners are
+    shared vertices. ``grid`` may be a window of rows starting at maze row
+    ``row_offset`` (see extract_wall_runs) that holds every wall next to the
+    runs.
+    """
+    if not 0 < thickness < unit_size:
+        raise ValueError("wall thickness must be between 0 and the unit size")
+    grid = as_maze_grid(grid)
+    if row_offset:
+        runs = runs.copy()
+        runs[:, [1, 3]] -= row_offset
+    h, w = grid.height, grid.width
+    # Planes padded by one wall on each side along their run direction
+    h_pad = np.zeros((h + 1, w + 2), dtype=bool)
+    h_pad[:, 1:-1] = grid.horizontal
+    v_pad = np.zeros((h + 2, w + 1), dtype=bool)
+    v_pad[1:-1, :] = grid.vertical
+    # Corners with a horizontal wall on either side
+    covered = h_pad[:, :-1] | h_pad[:, 1:]
+    runs = _split_at_posts(runs, covered)
+
+    # Every box side sits on a lattice line moved by -1, 0 or +1 half
+    # thicknesses, so positions are integer "sub-lattice" steps 3 * corner +
+    # shift + 1 and coincident corners get identical keys
+    x0, y0, x1, y1 = (runs[:, i].astype(np.int64) for i in range(4))
+    is_h = y0 == y1
+    vv = ~is_h
+    lo = np.empty(len(runs), dtype=np.int64)
+    hi = np.empty(len(runs), dtype=np.int64)
+    # Horizontal runs: extend over the post unless the wall line continues
+    lo[is_h] = np.where(h_pad[y0[is_h], x0[is_h]], 0, -1)
+    hi[is_h] = np.where(h_pad[y1[is_h], x1[is_h] + 1], 0, 1)
+    # Vertical runs: trim to a horizontal post, else flush or extend
+    lo[vv] = np.where(covered[y0[vv], x0[vv]], 1, np.where(v_pad[y0[vv], x0[vv]], 0, -1))
+    hi[vv] = np.where(covered[y1[vv], x1[vv]], -1, np.where(v_pad[y1[vv] + 1, x1[vv]], 0, 1))
+
+    xmin = 3 * x0 + 1 + np.where(is_h, lo, -1)
+    xmax = 3 * x1 + 1 + np.where(is_h, hi, 1)
+    ymin = 3 * y0 + 1 + np.where(is_h, -1, lo)
+    ymax = 3 * y1 + 1 + np.where(is_h, 1, hi)
+
+    stride = 3 * (w + 1)
+    ring = np.stack([ymin * stride + xmin, ymin * stride + xmax,
+                     ymax * stride + xmax, ymax * stride + xmin], axis=1)
+    keys = np.concatenate([2 * ring, 2 * ring + 1], axis=1)  # floor ring, top ring
+    used, index = np.unique(keys, return_inverse=True)
+
+    steps = np.array([-thickness / 2, 0.0, thickness / 2])
+    sub = used // 2
+    vertices = np.empty((len(used), 3), dtype=np.float32)
+    vertices[:, 0] = (sub % stride) // 3 * unit_size + steps[sub % stride % 3] + offset[0]
+    vertices[:, 1] = ((sub // stride) // 3 + row_offset) * unit_size + steps[sub // stride % 3] + offset[1]
+    vertices[:, 2] = (used % 2) * wall_height + offset[2]
+
+    index = index.reshape(-1, 8).astype(np.int32)
+    faces = index[:, _BOX_FACES].reshape(-1, 4)
+    return vertices, faces, np.repeat(runs[:, 4], len(_BOX_FACES))
+
+
+def build_wall_mesh(grid, unit_size, wall_height, start, end, merge=True,
+                    region=None, offset=(0.0, 0.0, 0.0), thickness=0.0, row_offset=0,
+                    maze_height=None):
+    """Return (vertices, faces, material_indices) for the maze walls.
+
+    ``vertices`` is a (N, 3) float32 array with one floor and one top vertex
+    per used lattice corner, ``faces`` a (F, 4) int32 array with one quad per
+    wall run (see ``extract_wall_runs``) and ``material_indices`` a (F,)
+    int32 array: 1 for the entry/exit walls, 0 for every other wall. With a
+    ``region`` only the walls owned by that tile are built. Normals point away
+    from the middle of the whole maze, so the outer walls face outwards. A
+    ``thickness`` above zero builds closed boxes instead (``runs_to_box_mesh``).
+    ``row_offset`` and ``maze_height`` mesh a window of a taller maze; the
+    vertices come out where the whole maze's would.
+    """
+    grid = as_maze_grid(grid)
+    if maze_height is None:
+        maze_height = grid.height + row_offset
+    runs = extract_wall_runs(grid, start, end, merge, region, row_offset, maze_height)
+    if thickness > 0:
+        return runs_to_box_mesh(grid, runs, unit_size, wall_height, thickness, offset,
+                                row_offset)
+    return runs_to_mesh(runs, unit_size, wall_height, offset,
+                        facing=(grid.width / 2, maze_height / 2))
+
+
+def build_path_mesh(path, unit_size, offset=(0.0, 0.0, 0.0)):
+    """Return (vertices, faces, material_indices) for a flat solution path.
+
+    One upward-facing quad per path cell in the z = 0 plane. Cells that touch,
+    even only at a corner, share their corner vertices, which is what a
+    remove-doubles pass over separate squares would give.
+    """
+    cells = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+    corners = np.concatenate([cells, cells + (1, 0), cells + (1, 1), cells + (0, 1)])
+    stride = int(corners[:, 0].max()) + 1 if len(cells) else 1
+    keys = corners[:, 1] * stride + corners[:, 0]
+    used, index = np.unique(keys, return_inverse=True)
+
+    vertices = np.zeros((len(used), 3), dtype=np.float32)
+    vertices[:, 0] = (used % stride) * unit_size + offset[0]
+    vertices[:, 1] = (used // stride) * unit_size + offset[1]
+    vertices[:, 2] = offset[2]
+    # Counter-clockwise seen from above, so the normals point up
+    faces = index.reshape(4, -1).T.astype(np.int32)
+    return vertices, faces, np.zeros(len(faces), dtype=np.int32)
+
+
+def tile_fingerprint(grid, start, end, region, *params):
+    """Short hash of everything a tile mesh depends on.
+
+    Covers the walls the region owns plus the ring of walls around it (thick
+    walls are trimmed against their neighbours), whether it holds an
+    entry/exit wall and any extra build ``params`` (unit size, wall height,
+    ...). A tile only needs rebuilding when its fingerprint changes.
+    """
+    grid = as_maze_grid(grid)
+    x0, y0, x1, y1 = region if region is not None else (0, 0, grid.width, grid.height)
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(np.ascontiguousarray(
+        grid.horizontal[y0:y1 + 1, max(x0 - 1, 0):x1 + 1]).tobytes())
+    digest.update(np.ascontiguousarray(
+        grid.vertical[max(y0 - 1, 0):y1 + 1, x0:x1 + 1]).tobytes())
+    digest.update(repr((MESH_VERSION, region,
+                        _terminal_walls(grid.width, grid.height, (start, end)),
+                        params)).encode())
+    return digest.hexdigest()
+
+
+def wall_instances(grid, start, end, unit_size, offset=(0.0, 0.0, 0.0)):
+    """One instance point per unit wall: (positions, rotations, terminal).
+
+    Every wall is the same unit-long panel, so instead of geometry it can be
+    described by the floor-level midpoint of the wall (``positions``, (N, 3)
+    float32), an Euler rotation (``rotations``, (N, 3) float32; 0 about Z for
+    walls along X, pi/2 for walls along Y) and whether it is an entry/exit
+    wall (``terminal``, (N,) bool).
+    """
+    runs = extract_wall_runs(grid, start, end, merge=False)
+    along_y = runs[:, 0] == runs[:, 2]
+    positions = np.empty((len(runs), 3), dtype=np.float32)
+    positions[:, 0] = (runs[:, 0] + runs[:, 2]) * (unit_size / 2) + offset[0]
+    positions[:, 1] = (runs[:, 1] + runs[:, 3]) * (unit_size / 2) + offset[1]
+    positions[:, 2] = offset[2]
+    rotations = np.zeros((len(runs), 3), dtype=np.float32)
+    rotations[along_y, 2] = np.pi / 2
+    return positions, rotations, runs[:, 4] == 1
@@ -0,0 +1,131 @@
+"""Queue-driven dead-end pruning for the algebraic byproduct solver.
+
+Every cell starts with its passage count as degree and the start/end
+terminals are protected. A cell of degree <= 1 is removed and its open
+neighbors lose one degree, which may turn them into new dead ends. Each cell
+is removed at most once and each passage is relaxed at most twice, so the
+whole prune runs in O(cells) instead of one full scan per pruning round.
+
+Pruning only removes trees hanging off the route. In a braided maze the
+loops survive with it, so solve_by_pruning then picks the route with a BFS
+restricted to the surviving core, which is far smaller than the maze.
+"""
+from array import array
+
+import numpy as np
+
+from .grid import TOP, RIGHT, BOTTOM, LEFT, as_maze_grid
+
+# Large enough that a terminal never becomes a dead end
+TERMINAL_DEGREE = 10
+
+
+def _neighbor_steps(width):
+    """(wall bit, flat index offset) for each side of a cell."""
+    return ((TOP, -width), (RIGHT, 1), (BOTTOM, width), (LEFT, -1))
+
+
+def prune_dead_ends(grid, start, end):
+    """Prune every dead-end branch and return (alive bytearray, open masks).
+
+    ``alive[y * width + x]`` is 1 for each surviving cell; ``open masks`` is
+    the flat list of 4-bit masks of the *open* sides of every cell.
+    """
+    grid = as_maze_grid(grid)
+    w = grid.width
+    n = w * grid.height
+    steps = _neighbor_steps(w)
+
+    open_masks = grid.passage_masks().ravel().tolist()
+    degree_arr = grid.degrees().ravel()
+    worklist = np.flatnonzero(degree_arr <= 1).tolist()
+    degree = degree_arr.tolist()
+    for x, y in (start, end):
+        degree[y * w + x] += TERMINAL_DEGREE
+
+    alive = bytearray(b'\x01') * n
+    pop, push = worklist.pop, worklist.append
+    while worklist:
+        i = pop()
+        if not alive[i] or degree[i] > 1:
+            continue
+        alive[i] = 0
+        m = open_masks[i]
+        for bit, step in steps:
+            if m & bit:
+                j = i + step
+                if alive[j]:
+                    degree[j] -= 1
+                    if degree[j] == 1:
+                        push(j)
+    return alive, open_masks
+
+
+def _walk(alive, open_masks, width, start, end):
+    """Greedy walk over surviving cells from start; returns the flat indices visited."""
+    steps = _neighbor_steps(width)
+    seen = bytearray(len(alive))
+    goal = end[1] * width + end[0]
+    cur = start[1] * width + start[0]
+    order = []
+    while cur >= 0:
+        seen[cur] = 1
+        order.append(cur)
+        if cur == goal:
+            break
+        m = open_masks[cur]
+        nxt = -1
+        for bit, step in steps:
+            if m & bit:
+                j = cur + step
+                if alive[j] and not seen[j]:
+                    nxt = j
+                    break
+        cur = nxt
+    return order
+
+
+def surviving_route(alive, open_masks, width, start, end):
+    """Shortest start-end route through surviving cells only, or None."""
+    steps = _neighbor_steps(width)
+    s = start[1] * width + start[0]
+    t = end[1] * width + end[0]
+    parent = array('i', [-1]) * len(alive)
+    parent[s] = s
+    queue = array('i', [s])
+    for i in queue:
+        if i == t:
+            route = [t]
+            while i != s:
+                i = parent[i]
+                route.append(i)
+            return [(i % width, i // width) for i in reversed(route)]
+        m = open_masks[i]
+        for bit, step in steps:
+            if m & bit:
+                j = i + step
+                if alive[j] and parent[j] < 0:
+                    parent[j] = i
+                    queue.append(j)
+    return None
+
+
+def solve_by_pruning(grid, start, end):
+    """Algebraic byproduct solver: prune dead ends, return path cells in walk order.
+
+    Safe on mazes with loops: when the survivors are more than one start-end
+    walk, the route is picked among them by surviving_route. Returns None
+    when ``end`` cannot be reached.
+    """
+    grid = as_maze_grid(grid)
+    alive, open_masks = prune_dead_ends(grid, start, end)
+    w = grid.width
+    order = _walk(alive, open_masks, w, start, end)
+    if order[-1] == end[1] * w + end[0] and len(order) == alive.count(1):
+        # The walk covers every survivor; it is the route unless they close a loop
+        steps = _neighbor_steps(w)
+        links = sum(1 for i in order for bit, step in steps
+                    if open_masks[i] & bit and alive[i + step])
+        if links == 2 * (len(order) - 1):
+            return [(i % w, i // w) for i in order]
+    return surviving_route(alive, open_masks, grid.width, start, end)
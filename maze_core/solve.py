@@ -0,0 +1,242 @@
+"""Maze solvers over flat cell indices, plus algebraic dead-end pruning.
+
+Cell (x, y) is index ``y * width + x``. Parent and distance bookkeeping are
+preallocated ``array('i')`` buffers (4 bytes per cell), queues are int arrays
+too, and the open sides of every cell are one byte of a ``passage_masks``
+buffer, so the inner loops only do integer arithmetic: no tuples, dicts or
+per-edge wall lookups.
+
+solve_dijkstra also takes per-cell traversal costs (see
+generators.cost_plane) and, like the searches, stays exact on braided mazes
+with loops (see generators.braid_maze). ``get_solver(name, costs)`` binds
+costs to the solvers that use them.
+
+Every solver takes ``(grid, start, end)`` and returns the (x, y) cells from
+start to end inclusive. When there is no route they raise NoRouteError
+instead of returning a bogus path.
+"""
+import functools
+import heapq
+import math
+from array import array
+
+import numpy as np
+
+from .grid import as_maze_grid
+from .prune import _neighbor_steps, solve_by_pruning
+
+
+class NoRouteError(ValueError):
+    """The end cell cannot be reached from the start cell."""
+
+    def __init__(self, start, end):
+        super().__init__(f"{end} is unreachable from {start}")
+        self.start = start
+        self.end = end
+
+
+def _setup(grid, start, end):
+    grid = as_maze_grid(grid)
+    w = grid.width
+    for x, y in (start, end):
+        if not (0 <= x < w and 0 <= y < grid.height):
+            raise ValueError(f"cell {(x, y)} is outside the {w}x{grid.height} maze")
+    masks = grid.passage_masks().tobytes()
+    return w, len(masks), masks, _neighbor_steps(w), start[1] * w + start[0], end[1] * w + end[0]
+
+
+def _chain(parent, i, stop):
+    """Flat indices from ``i`` back to ``stop`` inclusive, following ``parent``."""
+    cells = [i]
+    while i != stop:
+        i = parent[i]
+        cells.append(i)
+    return cells
+
+
+def _to_cells(indices, width):
+    return [(i % width, i // width) for i in indices]
+
+
+def solve_bfs(grid, start, end):
+    """Breadth-first search; returns a shortest path."""
+    w, n, masks, steps, s, t = _setup(grid, start, end)
+    parent = array('i', [-1]) * n
+    parent[s] = s
+    queue = array('i', [s])
+    for i in queue:
+        if i == t:
+            return _to_cells(_chain(parent, t, s)[::-1], w)
+        m = masks[i]
+        for bit, step in steps:
+            if m & bit:
+                j = i + step
+                if parent[j] < 0:
+                    parent[j] = i
+                    queue.append(j)
+    raise NoRouteError(start, end)
+
+
+def solve_bidirectional(grid, start, end):
+    """BFS from both ends at once, always growing the smaller frontier.
+
+    Each side only explores about half the path length, which pays off most
+    on mazes with loops and short routes through open areas.
+    """
+    w, n, masks, steps, s, t = _setup(grid, start, end)
+    if s == t:
+        return [start]
+    parent = (array('i', [-1]) * n, array('i', [-1]) * n)
+    dist = (array('i', [-1]) * n, array('i', [-1]) * n)
+    parent[0][s], parent[1][t] = s, t
+    dist[0][s], dist[1][t] = 0, 0
+    frontiers = (array('i', [s]), array('i', [t]))
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own_parent, own_dist = parent[side], dist[side]
+        other_dist = dist[1 - side]
+        best, meet = n + 1, -1
+        grown = array('i')
+        # Finish the whole level so the shortest of its meeting points wins
+        for i in frontiers[side]:
+            m = masks[i]
+            d = own_dist[i] + 1
+            for bit, step in steps:
+                if m & bit:
+                    j = i + step
+                    if own_dist[j] < 0:
+                        own_dist[j] = d
+                        own_parent[j] = i
+                        grown.append(j)
+                    if other_dist[j] >= 0 and own_dist[j] + other_dist[j] < best:
+                        best, meet = own_dist[j] + other_dist[j], j
+        if meet >= 0:
+            head = _chain(parent[0], meet, s)[::-1]
+            tail = _chain(parent[1], meet, t)
+            return _to_cells(head + tail[1:], w)
+        frontiers = (grown, frontiers[1]) if side == 0 else (frontiers[0], grown)
+    raise NoRouteError(start, end)
+
+
+def solve_astar(grid, start, end):
+    """A* with the Manhattan distance to ``end`` as heuristic; returns a shortest path.
+
+    Ties on f are broken towards the larger g, so on open stretches the
+    search dives towards the goal instead of widening.
+    """
+    w, n, masks, steps, s, t = _setup(grid, start, end)
+    tx, ty = end
+    parent = array('i', [-1]) * n
+    g = array('i', [-1]) * n
+    parent[s] = s
+    g[s] = 0
+    heap = [(abs(start[0] - tx) + abs(start[1] - ty), 0, s)]
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        _, neg_g, i = pop(heap)
+        if -neg_g != g[i]:
+            continue  # stale entry
+        if i == t:
+            return _to_cells(_chain(parent, t, s)[::-1], w)
+        m = masks[i]
+        d = g[i] + 1
+        for bit, step in steps:
+            if m & bit:
+                j = i + step
+                if g[j] < 0 or d < g[j]:
+                    g[j] = d
+                    parent[j] = i
+                    push(heap, (d + abs(j % w - tx) + abs(j // w - ty), -d, j))
+    raise NoRouteError(start, end)
+
+
+def solve_dijkstra(grid, start, end, costs=None):
+    """Cheapest path by Dijkstra's algorithm with a binary heap.
+
+    ``costs[y, x]`` (non-negative) is the price of stepping into cell (x, y);
+    without costs every step costs 1. Unlike the pruning solver this is
+    exact on braided mazes with loops.
+    """
+    w, n, masks, steps, s, t = _setup(grid, start, end)
+    if costs is None:
+        cost = array('d', [1.0]) * n
+    else:
+        costs = np.ascontiguousarray(costs, dtype=np.float64)
+        if costs.shape != (n // w, w):
+            raise ValueError(f"costs must have shape {(n // w, w)}, got {costs.shape}")
+        if (costs < 0).any():
+            raise ValueError("costs must be non-negative")
+        cost = array('d')
+        cost.frombytes(costs.tobytes())
+    dist = array('d', [math.inf]) * n
+    parent = array('i', [-1]) * n
+    dist[s] = 0.0
+    parent[s] = s
+    heap = [(0.0, s)]
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        d, i = pop(heap)
+        if d > dist[i]:
+            continue  # stale entry
+        if i == t:
+            return _to_cells(_chain(parent, t, s)[::-1], w)
+        m = masks[i]
+        for bit, step in steps:
+            if m & bit:
+                j = i + step
+                nd = d + cost[j]
+                if nd < dist[j]:
+                    dist[j] = nd
+                    parent[j] = i
+                    push(heap, (nd, j))
+    raise NoRouteError(start, end)
+
+
+def path_cost(path, costs):
+    """Total cost of walking ``path``: the costs of every cell after the first."""
+    cells = np.asarray(path, dtype=np.int64).reshape(-1, 2)[1:]
+    return float(np.asarray(costs, dtype=np.float64)[cells[:, 1], cells[:, 0]].sum())
+
+
+def solve_maze(grid, start, end):
+    """Breadth‑first search to find the path from start to end."""
+    return solve_bfs(grid, start, end)
+
+
+def solve_maze_algebraic(grid, start, end):
+    """Prune dead ends until only the start-end byproduct remains, in walk order.
+
+    On braided mazes the route is picked among the cells pruning leaves.
+    """
+    path = solve_by_pruning(grid, start, end)
+    if path is None:
+        raise NoRouteError(start, end)
+    return path
+
+
+SOLVERS = {
+    "bfs": solve_bfs,
+    "bidirectional": solve_bidirectional,
+    "astar": solve_astar,
+    "dijkstra": solve_dijkstra,
+    "algebraic": solve_maze_algebraic,
+}
+
+# Solvers taking a ``costs`` keyword; the others count steps
+WEIGHTED_SOLVERS = frozenset({"dijkstra"})
+
+
+def get_solver(name, costs=None):
+    """The ``(grid, start, end)`` solver called ``name``.
+
+    ``costs`` are bound to weighted solvers; the others ignore them.
+    """
+    try:
+        solver = SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown maze solver {name!r}; "
+                         f"choose from {', '.join(sorted(SOLVERS))}") from None
+    if costs is not None and name in WEIGHTED_SOLVERS:
+        return functools.partial(solver, costs=costs)
+    return solver
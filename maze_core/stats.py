@@ -0,0 +1,64 @@
+"""Per-phase wall-clock timers and counters for one generate or solve run.
+
+Timing is taken around whole phases (generation, meshing, loading into
+Blender, ...), never per cell, so the bookkeeping itself costs nothing
+measurable.
+"""
+import time
+from contextlib import contextmanager
+
+
+class PhaseStats:
+    """Accumulated seconds per phase plus named integer counters.
+
+    Both dicts keep insertion order, so phases read back in the order they
+    first ran.
+    """
+
+    __slots__ = ('phases', 'counters')
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+
+    def add_time(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body of a ``with`` block as phase ``name``."""
+        t0 = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(name, time.perf_counter() - t0)
+
+    def iterate(self, name, iterable):
+        """Yield from ``iterable``, timing only the work done inside it.
+
+        Time the consumer spends between items (e.g. a modal operator
+        waiting for its next timer event) is not counted.
+        """
+        items = iter(iterable)
+        while True:
+            t0 = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                self.add_time(name, time.perf_counter() - t0)
+                return
+            self.add_time(name, time.perf_counter() - t0)
+            yield item
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    @property
+    def total(self):
+        return sum(self.phases.values())
+
+    def summary(self):
+        """Human readable lines: one per phase, then one per counter."""
+        lines = [f"{name}: {seconds:.3f} s" for name, seconds in self.phases.items()]
+        lines += [f"{name}: {value:,}" for name, value in self.counters.items()]
+        return lines
@@ -0,0 +1,116 @@
+"""Storage formats for generated mazes.
+
+* ``save_maze``/``load_maze``: a compressed ``.npz`` on disk with the two
+  wall planes packed to one bit per wall, the start/end cells, the generator
+  seed and (optionally) the solution as flat ``y * width + x`` cell indices
+  and the per-cell step costs (see generators.cost_plane).
+* ``pack_maze``/``unpack_maze``: the same walls, start/end, seed and costs as
+  one small self-describing ``bytes`` blob, for embedding in .blend files.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+from .grid import MazeGrid
+
+
+def save_maze(path, grid, start, end, seed=None, solution=None, costs=None):
+    """Write a maze (and optional solution path and costs) to ``path`` as compressed npz."""
+    fields = {
+        "size": np.array([grid.width, grid.height], dtype=np.int64),
+        "horizontal": np.packbits(grid.horizontal, axis=None),
+        "vertical": np.packbits(grid.vertical, axis=None),
+        "start": np.array(start, dtype=np.int64),
+        "end": np.array(end, dtype=np.int64),
+    }
+    if seed is not None:
+        fields["seed"] = np.array(seed, dtype=np.int64)
+    if solution is not None:
+        fields["solution"] = np.array([y * grid.width + x for x, y in solution],
+                                      dtype=np.int64)
+    if costs is not None:
+        fields["costs"] = _check_costs(grid, costs)
+    np.savez_compressed(path, **fields)
+
+
+def load_maze(path):
+    """Read a maze written by save_maze.
+
+    Returns ``(grid, start, end, seed, solution, costs)``; ``seed``,
+    ``solution`` and ``costs`` are None when they were not stored.
+    """
+    with np.load(path) as data:
+        width, height = (int(v) for v in data["size"])
+        horizontal = np.unpackbits(data["horizontal"], count=(height + 1) * width)
+        vertical = np.unpackbits(data["vertical"], count=height * (width + 1))
+        grid = MazeGrid(width, height,
+                        horizontal.reshape(height + 1, width),
+                        vertical.reshape(height, width + 1))
+        start = tuple(int(v) for v in data["start"])
+        end = tuple(int(v) for v in data["end"])
+        seed = int(data["seed"]) if "seed" in data else None
+        solution = None
+        if "solution" in data:
+            solution = [(int(i) % width, int(i) // width) for i in data["solution"]]
+        costs = data["costs"] if "costs" in data else None
+    return grid, start, end, seed, solution, costs
+
+
+def _check_costs(grid, costs):
+    costs = np.ascontiguousarray(costs, dtype=np.float32)
+    if costs.shape != (grid.height, grid.width):
+        raise ValueError(f"costs must have shape {(grid.height, grid.width)}, got {costs.shape}")
+    return costs
+
+
+# -----------------------------------------------------------------------------
+# Binary blob
+# -----------------------------------------------------------------------------
+BLOB_MAGIC = b"LEMB"
+BLOB_VERSION = 2
+# magic, version, width, height, start x/y, end x/y, seed (-1 = none)
+_BLOB_HEADER = struct.Struct("<4sBqqqqqqq")
+# Version 2 follows with the compressed wall size; compressed float32 costs,
+# if any, come after the walls
+_BLOB_WALLS = struct.Struct("<q")
+
+
+def pack_maze(grid, start, end, seed=None, costs=None):
+    """Encode walls, start/end, seed and optional costs as a compact bytes blob."""
+    header = _BLOB_HEADER.pack(BLOB_MAGIC, BLOB_VERSION, grid.width, grid.height,
+                               start[0], start[1], end[0], end[1],
+                               -1 if seed is None else seed)
+    bits = np.packbits(np.concatenate([grid.horizontal.ravel(),
+                                       grid.vertical.ravel()]))
+    walls = zlib.compress(bits.tobytes(), 6)
+    blob = header + _BLOB_WALLS.pack(len(walls)) + walls
+    if costs is not None:
+        blob += zlib.compress(_check_costs(grid, costs).astype("<f4").tobytes(), 6)
+    return blob
+
+
+def unpack_maze(blob):
+    """Decode a pack_maze blob into ``(grid, start, end, seed, costs)``.
+
+    Version 1 blobs, written before costs existed, are still read.
+    """
+    magic, version, width, height, sx, sy, ex, ey, seed = \
+        _BLOB_HEADER.unpack_from(blob)
+    if magic != BLOB_MAGIC or version not in (1, BLOB_VERSION):
+        raise ValueError("Not a Lead Edge maze blob")
+    body = blob[_BLOB_HEADER.size:]
+    extra = b""
+    if version >= 2:
+        size, = _BLOB_WALLS.unpack_from(body)
+        body, extra = body[_BLOB_WALLS.size:_BLOB_WALLS.size + size], body[_BLOB_WALLS.size + size:]
+    h_count = (height + 1) * width
+    bits = np.frombuffer(zlib.decompress(body), dtype=np.uint8)
+    walls = np.unpackbits(bits, count=h_count + height * (width + 1))
+    grid = MazeGrid(width, height,
+                    walls[:h_count].reshape(height + 1, width),
+                    walls[h_count:].reshape(height, width + 1))
+    costs = None
+    if extra:
+        costs = np.frombuffer(zlib.decompress(extra), dtype="<f4").reshape(height, width)
+    return grid, (sx, sy), (ex, ey), None if seed < 0 else seed, costs
@@ -0,0 +1,179 @@
+"""Streaming maze generation (Eller's algorithm) for mazes larger than RAM.
+
+``eller_rows`` yields the maze one row at a time and only ever holds O(width)
+state: the set label of each cell in the current row. ``write_streamed_maze``
+appends those rows to a memory-mapped file of bit-packed wall rows, and
+``StreamedMaze`` reads horizontal strips of such a file back as ordinary
+MazeGrid objects, which ``export_maze`` meshes and writes one strip at a
+time (see maze_core.export.iter_mesh_tiles).
+
+File layout (all integers little-endian int64)::
+
+    header   magic, version, width, height, start x/y, end x/y
+    horizontal plane  (height + 1) rows of ceil(width / 8) bytes
+    vertical plane    height rows of ceil((width + 1) / 8) bytes
+"""
+import numpy as np
+
+from .grid import MazeGrid
+
+MAGIC = 0x5A4D454C  # b"LEMZ"
+VERSION = 1
+HEADER_FIELDS = 8
+HEADER_BYTES = HEADER_FIELDS * 8
+
+
+def random_perimeter_cell(width, height, rng, exclude_cell=None):
+    """Uniform random perimeter cell, computed without listing the perimeter."""
+    while True:
+        if height == 1:
+            cell = (int(rng.integers(width)), 0)
+        elif width == 1:
+            cell = (0, int(rng.integers(height)))
+        else:
+            i = int(rng.integers(2 * width + 2 * (height - 2)))
+            if i < 2 * width:
+                cell = (i // 2, 0 if i % 2 == 0 else height - 1)
+            else:
+                i -= 2 * width
+                cell = (0 if i % 2 == 0 else width - 1, 1 + i // 2)
+        if cell != exclude_cell or width * height == 1:
+            return cell
+
+
+def eller_rows(width, height, rng, join_chance=0.5, down_chance=0.5):
+    """Yield ``(vertical, bottom)`` uint8 wall rows of a perfect maze.
+
+    ``vertical`` has width + 1 entries (the left wall of every cell plus the
+    right border), ``bottom`` has width entries (the wall under every cell).
+    The top border row is implicitly all walls.
+    """
+    labels = list(range(width))
+    for y in range(height):
+        last = y == height - 1
+        vertical = np.ones(width + 1, dtype=np.uint8)
+        bottom = np.ones(width, dtype=np.uint8)
+
+        # Join horizontally adjacent cells of different sets
+        parent = list(range(width))
+
+        def find(a):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        joins = rng.random(width).tolist()
+        for x in range(width - 1):
+            a = find(labels[x])
+            b = find(labels[x + 1])
+            if a != b and (last or joins[x] < join_chance):
+                vertical[x + 1] = 0
+                parent[b] = a
+        labels = [find(label) for label in labels]
+
+        if not last:
+            # Every set carries on downwards through at least one cell
+            downs = rng.random(width).tolist()
+            picks = rng.random(width).tolist()
+            seen = {}
+            chosen = {}
+            for x, label in enumerate(labels):
+                seen[label] = seen.get(label, 0) + 1
+                # Reservoir-sample one guaranteed cell per set
+                if picks[x] * seen[label] < 1.0:
+                    chosen[label] = x
+                if downs[x] < down_chance:
+                    bottom[x] = 0
+            for x in chosen.values():
+                bottom[x] = 0
+
+            # Cells without a passage down start fresh sets in the next row
+            used = {labels[x] for x in range(width) if not bottom[x]}
+            free = (label for label in range(width) if label not in used)
+            labels = [labels[x] if not bottom[x] else next(free)
+                      for x in range(width)]
+        yield vertical, bottom
+
+
+def _plane_shapes(width, height):
+    return ((height + 1, (width + 7) // 8), (height, (width + 8) // 8))
+
+
+def write_streamed_maze(path, width, height, seed=None, flush_every=1024):
+    """Generate a maze row by row straight into a memory-mapped file.
+
+    Returns ``(start, end)``. Memory use is O(width) regardless of height.
+    """
+    rng = np.random.default_rng(seed)
+    start = random_perimeter_cell(width, height, rng)
+    end = random_perimeter_cell(width, height, rng, exclude_cell=start)
+
+    h_shape, v_shape = _plane_shapes(width, height)
+    h_bytes = h_shape[0] * h_shape[1]
+    total = HEADER_BYTES + h_bytes + v_shape[0] * v_shape[1]
+    with open(path, "wb") as fh:
+        fh.truncate(total)
+
+    header = np.memmap(path, dtype="<i8", mode="r+", shape=(HEADER_FIELDS,))
+    header[:] = (MAGIC, VERSION, width, height, start[0], start[1], end[0], end[1])
+    header.flush()
+    del header
+
+    horizontal = np.memmap(path, dtype=np.uint8, mode="r+",
+                           offset=HEADER_BYTES, shape=h_shape)
+    vertical = np.memmap(path, dtype=np.uint8, mode="r+",
+                         offset=HEADER_BYTES + h_bytes, shape=v_shape)
+    horizontal[0] = np.packbits(np.ones(width, dtype=np.uint8))
+    for y, (v_row, bottom) in enumerate(eller_rows(width, height, rng)):
+        vertical[y] = np.packbits(v_row)
+        horizontal[y + 1] = np.packbits(bottom)
+        if (y + 1) % flush_every == 0:
+            horizontal.flush()
+            vertical.flush()
+    horizontal.flush()
+    vertical.flush()
+    return start, end
+
+
+class StreamedMaze:
+    """Read-only view of a maze file written by write_streamed_maze."""
+
+    def __init__(self, path):
+        header = np.fromfile(path, dtype="<i8", count=HEADER_FIELDS)
+        if header[0] != MAGIC or header[1] != VERSION:
+            raise ValueError(f"{path} is not a streamed Lead Edge maze")
+        self.width = int(header[2])
+        self.height = int(header[3])
+        self.start = (int(header[4]), int(header[5]))
+        self.end = (int(header[6]), int(header[7]))
+        h_shape, v_shape = _plane_shapes(self.width, self.height)
+        self._horizontal = np.memmap(path, dtype=np.uint8, mode="r",
+                                     offset=HEADER_BYTES, shape=h_shape)
+        self._vertical = np.memmap(path, dtype=np.uint8, mode="r",
+                                   offset=HEADER_BYTES + h_shape[0] * h_shape[1],
+                                   shape=v_shape)
+
+    def strip(self, y0, y1):
+        """MazeGrid holding rows y0..y1-1 (with their top and bottom walls)."""
+        y1 = min(y1, self.height)
+        horizontal = np.unpackbits(self._horizontal[y0:y1 + 1], axis=1,
+                                   count=self.width)
+        vertical = np.unpackbits(self._vertical[y0:y1], axis=1,
+                                 count=self.width + 1)
+        return MazeGrid(self.width, y1 - y0, horizontal, vertical)
+
+    def iter_strips(self, rows=256, halo=0):
+        """Yield ``(first row, MazeGrid)`` strips of at most ``rows`` rows, top to bottom.
+
+        With a ``halo`` every strip also holds that many rows above and
+        below it (clipped to the maze), so the first row is ``y0 - halo``.
+        Thick wall meshing needs one row of neighbours on each side.
+        """
+        for y0 in range(0, self.height, rows):
+            row0 = max(y0 - halo, 0)
+            yield row0, self.strip(row0, y0 + rows + halo)
+
+    def load(self):
+        """Read the whole maze into memory as a single MazeGrid."""
+        return self.strip(0, self.height)
@@ -0,0 +1,257 @@
+"""Tree index for answering many cell-to-cell path queries on one maze.
+
+A perfect maze is a spanning tree of its cells, so the route between any two
+cells runs up from each of them to their lowest common ancestor (LCA). The
+index is built once per maze:
+
+* ``parent`` / ``depth``: flat int32 arrays from one BFS from the root cell,
+* ``up[k]``: the 2**k-th ancestor of every cell (binary lifting).
+
+After that a path length is O(log n) and the path itself comes out in
+O(path length), instead of a full BFS per query.
+
+Mazes with loops still get an index over a BFS spanning tree; its routes are
+valid walks through open passages but not necessarily the shortest ones
+(``perfect`` is False for those).
+
+Edits (see maze_core.edit) patch ``parent`` locally and call ``refresh``,
+which recomputes depths and lifting tables with vectorized pointer jumping
+instead of another Python-level BFS.
+"""
+import numpy as np
+
+from .grid import as_maze_grid
+from .prune import _neighbor_steps
+from .solve import NoRouteError
+
+
+class MazeTree:
+    """Rooted spanning tree of a maze with binary-lifting LCA tables."""
+
+    __slots__ = ('width', 'height', 'root', 'parent', 'depth', 'up', 'perfect')
+
+    def __init__(self, grid, root=(0, 0)):
+        grid = as_maze_grid(grid)
+        w = self.width = grid.width
+        self.height = grid.height
+        n = w * grid.height
+        self.root = root
+        steps = _neighbor_steps(w)
+
+        # BFS over flat indices; visiting in BFS order keeps depths exact
+        open_masks = grid.passage_masks().ravel().tolist()
+        parent = [-1] * n
+        depth = [-1] * n
+
+        def bfs(r):
+            parent[r] = r
+            depth[r] = 0
+            order = [r]
+            for i in order:
+                m = open_masks[i]
+                d = depth[i] + 1
+                for bit, step in steps:
+                    if m & bit:
+                        j = i + step
+                        if depth[j] < 0:
+                            depth[j] = d
+                            parent[j] = i
+                            order.append(j)
+            return order
+
+        reached = len(bfs(root[1] * w + root[0]))
+        self.parent = np.array(parent, dtype=np.int32)
+        self.depth = np.array(depth, dtype=np.int32)
+        if reached < n:
+            # Unreachable parts get their own BFS trees, so an edit that
+            # opens a wall into one can hang it below the root in one piece
+            unreached = np.flatnonzero(self.depth < 0)
+            for i in unreached.tolist():
+                if parent[i] < 0:
+                    bfs(i)
+            self.parent[unreached] = np.array(parent, dtype=np.int32)[unreached]
+            self.depth[unreached] = -1
+        self.perfect = reached == n and int(grid.degrees().sum()) == 2 * (n - 1)
+        self._build_lifting()
+
+    def _build_lifting(self):
+        levels = max(1, int(self.depth.max()).bit_length())
+        up = np.empty((levels, len(self.parent)), dtype=np.int32)
+        up[0] = self.parent
+        for k in range(1, levels):
+            up[k] = up[k - 1][up[k - 1]]
+        self.up = up
+
+    def refresh(self, grid):
+        """Recompute depths, lifting tables and ``perfect`` after ``parent`` was patched.
+
+        Cells whose parent chain no longer ends at the root become
+        unreachable (depth -1).
+        """
+        grid = as_maze_grid(grid)
+        n = len(self.parent)
+        anc = self.parent
+        dist = (anc != np.arange(n)).astype(np.int32)
+        # Pointer jumping: after round k every cell knows its 2**k-th
+        # ancestor, which is exactly row k of the lifting table
+        rows = [anc]
+        while True:
+            nxt = anc[anc]
+            if np.array_equal(nxt, anc):
+                break
+            dist += dist[anc]
+            anc = nxt
+            rows.append(anc)
+        reached = anc == self._index(self.root)
+        self.depth = np.where(reached, dist, -1).astype(np.int32)
+        self.perfect = bool(reached.all()) and int(grid.degrees().sum()) == 2 * (n - 1)
+        levels = max(1, int(self.depth.max()).bit_length())
+        if self.up.shape[0] == levels:
+            # Refill the existing table; a fresh one costs more to allocate
+            for k in range(levels):
+                self.up[k] = rows[k]
+        else:
+            self.up = np.stack(rows[:levels])
+
+    def _top(self, i):
+        """Top of the tree ``i`` hangs in: the root, or a detached part's own top."""
+        parent = self.parent
+        while parent[i] != i:
+            i = int(parent[i])
+        return i
+
+    def _reroot(self, i):
+        """Make ``i`` the top of its (detached) tree by reversing its parent chain."""
+        prev, cur = i, int(self.parent[i])
+        while cur != prev:
+            nxt = int(self.parent[cur])
+            self.parent[cur] = prev
+            prev, cur = cur, nxt
+        self.parent[i] = i
+
+    def update_wall(self, grid, a, b):
+        """Patch the index after the wall between adjacent cells a and b changed.
+
+        Call it after the grid was edited (see maze_core.edit.toggle_wall).
+        Opening a wall between two separate trees hangs one below the other
+        (an unreachable part below a reachable cell); closing a tree edge
+        cuts the child's subtree off. A loop, or a cut on a maze with loops
+        where the subtree may still be reachable another way, rebuilds the
+        index from scratch.
+        """
+        grid = as_maze_grid(grid)
+        i, j = self._index(a), self._index(b)
+        if b in grid.open_neighbors(*a):
+            if self._top(i) == self._top(j):
+                self.__init__(grid, self.root)
+                return
+            if self.depth[i] < 0:
+                i, j = j, i
+            self._reroot(j)
+            self.parent[j] = i
+        elif self.parent[i] == j or self.parent[j] == i:
+            if not self.perfect:
+                self.__init__(grid, self.root)
+                return
+            # The child's subtree becomes its own, unreachable tree
+            child = i if self.parent[i] == j else j
+            self.parent[child] = child
+        else:
+            # Closing a loop edge leaves every route of the tree intact
+            n = len(self.parent)
+            self.perfect = (bool((self.depth >= 0).all())
+                            and int(grid.degrees().sum()) == 2 * (n - 1))
+            return
+        self.refresh(grid)
+
+    def _index(self, cell):
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"cell {cell} is outside the {self.width}x{self.height} maze")
+        return y * self.width + x
+
+    def connected(self, a, b):
+        """True if a route exists, i.e. both cells lie in the root's component."""
+        return self.depth[self._index(a)] >= 0 and self.depth[self._index(b)] >= 0
+
+    def _lca(self, i, j):
+        up, depth = self.up, self.depth
+        if depth[i] < depth[j]:
+            i, j = j, i
+        diff = int(depth[i] - depth[j])
+        k = 0
+        while diff:
+            if diff & 1:
+                i = up[k, i]
+            diff >>= 1
+            k += 1
+        if i == j:
+            return int(i)
+        for k in range(len(up) - 1, -1, -1):
+            if up[k, i] != up[k, j]:
+                i, j = up[k, i], up[k, j]
+        return int(up[0, i])
+
+    def lca(self, a, b):
+        """Lowest common ancestor cell of two cells."""
+        if not self.connected(a, b):
+            raise NoRouteError(a, b)
+        k = self._lca(self._index(a), self._index(b))
+        return k % self.width, k // self.width
+
+    def distance(self, a, b):
+        """Number of steps between two cells along the tree."""
+        if not self.connected(a, b):
+            raise NoRouteError(a, b)
+        i, j = self._index(a), self._index(b)
+        d = self.depth
+        return int(d[i] + d[j] - 2 * d[self._lca(i, j)])
+
+    def path(self, a, b):
+        """Cells from ``a`` to ``b`` inclusive, as (x, y) tuples."""
+        if not self.connected(a, b):
+            raise NoRouteError(a, b)
+        i, j = self._index(a), self._index(b)
+        top = self._lca(i, j)
+        parent = self.parent
+        up_leg, down_leg = [], []
+        while i != top:
+            up_leg.append(i)
+            i = int(parent[i])
+        while j != top:
+            down_leg.append(j)
+            j = int(parent[j])
+        up_leg.append(top)
+        w = self.width
+        return [(k % w, k // w) for k in up_leg + down_leg[::-1]]
+
+    def distances(self, a_cells, b_cells):
+        """Vectorized ``distance`` for arrays of (x, y) cell pairs.
+
+        Returns an int64 array; pairs without a route get -1.
+        """
+        a = np.asarray(a_cells, dtype=np.int64).reshape(-1, 2)
+        b = np.asarray(b_cells, dtype=np.int64).reshape(-1, 2)
+        i = a[:, 1] * self.width + a[:, 0]
+        j = b[:, 1] * self.width + b[:, 0]
+        depth, up = self.depth, self.up
+        di, dj = depth[i].astype(np.int64), depth[j].astype(np.int64)
+
+        # Lift the deeper cell of every pair to the other's depth
+        swap = di < dj
+        lo = np.where(swap, i, j)
+        hi = np.where(swap, j, i)
+        diff = np.abs(di - dj)
+        for k in range(len(up)):
+            move = (diff >> k) & 1 == 1
+            hi[move] = up[k][hi[move]]
+        for k in range(len(up) - 1, -1, -1):
+            ui, uj = up[k][hi], up[k][lo]
+            move = ui != uj
+            hi[move] = ui[move]
+            lo[move] = uj[move]
+        top = np.where(hi == lo, hi, up[0][hi])
+
+        result = di + dj - 2 * depth[top]
+        result[(di < 0) | (dj < 0)] = -1
+        return result
@@ -0,0 +1,931 @@
+"""Scene state, drawing glue, operators and settings shared by the Lead Edge addons.
+
+__init__.py (the addon package) and lemacae.py (the single-file addon) both
+register the operators and scene properties defined here and only add their
+own panel and extras. maze_core and maze_scene are imported on first use, so
+registering stays cheap.
+"""
+import random
+
+import bpy
+
+# -----------------------------------------------------------------------------
+# Maze storage
+# -----------------------------------------------------------------------------
+# The maze itself lives on the scene as a maze_core.pack_maze blob, so it
+# survives file/addon reloads and takes part in undo. maze_data only caches
+# the decoded form of the blob it was built from, plus the tree index
+# (maze_core.MazeTree) route queries build from it on first use and the wall
+# fingerprint solution cache keys start with. Wall edits patch the tree in
+# place instead of dropping it.
+MAZE_PROP = "lead_edge_maze"
+
+maze_data = {
+    "blob": None,
+    "grid": None,
+    "start": None,
+    "end": None,
+    "seed": None,
+    "tree": None,
+    "costs": None,
+    "fingerprint": None
+}
+
+# Phase timings and counters of the last generate/solve (maze_core.PhaseStats),
+# shown in the panel
+maze_stats = {
+    "operator": None,
+    "stats": None
+}
+
+# Solved paths and built path meshes keyed by maze_core.solution_key; content
+# keyed, so editing or regenerating the maze needs no explicit invalidation
+solution_cache = None
+
+# Per-tile pieces of the Single Mesh walls (maze_core.TiledWallMesh), so a wall
+# edit only re-meshes the tiles whose fingerprint it changed
+wall_mesh = None
+
+# Live maze_scene.BackgroundJobs the modal operators started, each mapped to
+# whether its worker reads the stored grid. Wall edits wait until no such
+# worker runs; cancelling a modal operator does not stop its worker.
+background_jobs = {}
+
+# Generators registered in maze_core.generators
+MAZE_ALGORITHMS = [
+    ('backtracker', "Backtracker", "Recursive backtracker with long winding corridors"),
+    ('sidewinder',  "Sidewinder",  "Vectorized sidewinder, fast on large grids"),
+    ('binary_tree', "Binary Tree", "Vectorized binary tree, fastest but diagonally biased"),
+    ('tiled',       "Tiled",       "Independent sidewinder tiles stitched into one maze"),
+]
+
+# Solvers registered in maze_core.solve
+MAZE_SOLVERS = [
+    ('bfs',           "BFS",                 "Breadth-first search over flat cell arrays"),
+    ('bidirectional', "Bidirectional BFS",   "Search from both ends at once and meet in the middle"),
+    ('astar',         "A*",                  "A* search with a Manhattan distance heuristic"),
+    ('dijkstra',      "Dijkstra",            "Cheapest path with a binary heap; exact on braided mazes"),
+    ('algebraic',     "Algebraic Byproduct", "Prune dead ends until only the path remains"),
+]
+
+MAZE_OUTPUTS = [
+    ('MESH',      "Single Mesh", "One mesh object holding every wall"),
+    ('TILES',     "Tiles",       "One mesh object per tile; only changed tiles are rebuilt"),
+    ('INSTANCES', "Instances",   "One point per wall, instanced with Geometry Nodes"),
+]
+
+# Base color and emission strength of the materials the addon creates; an
+# addon restyles them in register(), before any of them exists
+MATERIALS = {
+    "MazeWallMat": ((1, 1, 1), 0.0),
+    "MazeEndMat":  ((1, 0, 0), 0.0),
+    "MazePathMat": ((0, 0, 1), 0.0),
+}
+
+# -----------------------------------------------------------------------------
+# Utilities
+# -----------------------------------------------------------------------------
+def _maze_core():
+    """Import the NumPy maze core on first use so register() stays cheap."""
+    try:
+        from . import maze_core
+    except ImportError:  # installed as a single-file addon next to maze_core
+        import maze_core
+    return maze_core
+
+def _maze_scene():
+    """Import the shared Blender mesh helpers on first use."""
+    try:
+        from . import maze_scene
+    except ImportError:
+        import maze_scene
+    return maze_scene
+
+def store_maze(scene, grid, start, end, seed=None, tree=None, costs=None):
+    """Persist the maze on the scene as a packed blob and prime the decode cache.
+
+    Edits pass the tree index they patched along, so it is not rebuilt, and
+    the maze's step costs, so they are kept.
+    """
+    blob = _maze_core().pack_maze(grid, start, end, seed, costs)
+    scene[MAZE_PROP] = blob
+    maze_data.update(blob=blob, grid=grid, start=start, end=end, seed=seed, tree=tree,
+                     costs=costs, fingerprint=None)
+
+def load_maze(scene):
+    """Return (grid, start, end) stored on the scene, decoding each blob only once."""
+    blob = scene.get(MAZE_PROP)
+    if blob is None:
+        return None, None, None
+    if blob != maze_data.get("blob"):
+        grid, start, end, seed, costs = _maze_core().unpack_maze(blob)
+        maze_data.update(blob=blob, grid=grid, start=start, end=end, seed=seed, tree=None,
+                         costs=costs, fingerprint=None)
+    return maze_data["grid"], maze_data["start"], maze_data["end"]
+
+def track_job(job, reads_maze):
+    """Remember a started BackgroundJob until it is done; see maze_busy."""
+    for done in [j for j in background_jobs if j.done]:
+        del background_jobs[done]
+    background_jobs[job] = reads_maze
+
+def maze_busy():
+    """True while the worker of a background job may still be reading the maze."""
+    return any(reads and not job.done for job, reads in background_jobs.items())
+
+def maze_fingerprint(grid):
+    """Wall hash of the stored maze, computed once per maze."""
+    if maze_data["fingerprint"] is None:
+        maze_data["fingerprint"] = _maze_core().grid_fingerprint(grid)
+    return maze_data["fingerprint"]
+
+def get_solution_cache(scene):
+    """The addon's LRU cache of solved paths and path meshes, sized from the scene."""
+    global solution_cache
+    if solution_cache is None:
+        solution_cache = _maze_core().LRUCache()
+    solution_cache.set_limit(scene.maze_cache_mb * 2**20)
+    return solution_cache
+
+def maze_tree(scene, stats):
+    """The stored maze's MazeTree rooted at its start, built once per maze."""
+    grid, start, _ = load_maze(scene)
+    if grid is None:
+        return None
+    if maze_data["tree"] is None:
+        with stats.phase("tree index"):
+            maze_data["tree"] = _maze_core().MazeTree(grid, start)
+    return maze_data["tree"]
+
+def publish_stats(label, stats):
+    """Make a finished run's PhaseStats the ones shown in the panel."""
+    maze_stats.update(operator=label, stats=stats)
+
+def profile_run(scene, func, *args):
+    """Call func(*args), under cProfile when 'Profile Next Run' is ticked.
+
+    Returns (result, path of the .prof dump or None). The toggle clears
+    itself, so exactly one operator run is captured.
+    """
+    if not scene.maze_profile:
+        return func(*args), None
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(func, *args)
+    finally:
+        path = bpy.path.abspath(scene.maze_profile_path)
+        profiler.dump_stats(path)
+        scene.maze_profile = False
+    return result, path
+
+def thickness_fits(operator, sc):
+    """Report and return False when box walls would be thicker than a cell."""
+    if sc.maze_output != 'INSTANCES' and sc.maze_wall_thickness >= sc.maze_unit_size:
+        operator.report({'ERROR'}, "Wall Thickness must be smaller than Unit Size")
+        return False
+    return True
+
+def get_material(name):
+    """Get or create the Principled BSDF material ``name`` styled from MATERIALS."""
+    mat = bpy.data.materials.get(name)
+    if mat is None:
+        color, emission = MATERIALS[name]
+        mat = bpy.data.materials.new(name=name)
+        mat.use_nodes = True
+        bsdf = mat.node_tree.nodes.get("Principled BSDF")
+        if bsdf:
+            bsdf.inputs['Base Color'].default_value = (color[0], color[1], color[2], 1)
+            bsdf.inputs['Roughness'].default_value = 0.5
+            if emission:
+                bsdf.inputs['Emission Color'].default_value = (color[0], color[1], color[2], 1)
+                bsdf.inputs['Emission Strength'].default_value = emission
+    return mat
+
+def clear_maze_and_path():
+    """Remove the maze, path and tile objects (and their meshes) this addon created."""
+    _maze_scene().clear_maze_objects()
+
+def wall_arrays(grid, unit_size, wall_height, start, end, thickness=0.0):
+    """build_wall_mesh arrays in the centered frame draw_3d_maze places."""
+    core = _maze_core()
+    grid = core.as_maze_grid(grid)
+    offset, _ = _maze_scene().maze_placement(grid.width, grid.height, unit_size, wall_height)
+    return core.build_wall_mesh(grid, unit_size, wall_height, start, end,
+                                offset=offset, thickness=thickness)
+
+def draw_3d_maze(grid, unit_size, wall_height, start, end, arrays=None, stats=None,
+                 thickness=0.0):
+    """Build a 3D mesh for the maze, coloring walls white and entry/exit red.
+
+    ``arrays`` may hold a precomputed wall_arrays result (e.g. from a
+    background job); otherwise it is computed here. Phases are timed into
+    ``stats`` when given. A ``thickness`` builds closed box walls, so no
+    Solidify modifier is needed.
+    """
+    core   = _maze_core()
+    output = _maze_scene()
+    stats  = stats or core.PhaseStats()
+    with stats.phase("clear"):
+        output.reset_outputs(keep=(output.WALLS,))
+
+    grid   = core.as_maze_grid(grid)
+    height = grid.height
+    width  = grid.width
+
+    # Reuse the walls object and its mesh from the last generate, if any
+    wall_mat = get_material("MazeWallMat")
+    end_mat  = get_material("MazeEndMat")
+    obj  = output.ensure_object(bpy.context.scene, output.WALLS, (wall_mat, end_mat))
+
+    # One quad per merged wall run on shared lattice vertices, already
+    # centered and facing outwards; entry/exit walls keep material index 1
+    if arrays is None:
+        with stats.phase("mesh arrays"):
+            arrays = wall_arrays(grid, unit_size, wall_height, start, end, thickness)
+    verts, faces, material_indices = arrays
+    stats.count("vertices", len(verts))
+    stats.count("faces", len(faces))
+    with stats.phase("load mesh"):
+        output.load_mesh_arrays(obj.data, verts, faces, material_indices)
+    obj.location = output.maze_placement(width, height, unit_size, wall_height)[1]
+
+def patched_wall_arrays(sc, grid, start, end, stats):
+    """Single Mesh arrays from wall_mesh, re-meshing only the tiles that changed."""
+    global wall_mesh
+    core = _maze_core()
+    if wall_mesh is None or wall_mesh.tile_size != sc.maze_tile_size:
+        wall_mesh = core.TiledWallMesh(sc.maze_tile_size)
+    grid = core.as_maze_grid(grid)
+    offset, _ = _maze_scene().maze_placement(grid.width, grid.height, sc.maze_unit_size, sc.maze_wall_height)
+    with stats.phase("patch walls"):
+        arrays = wall_mesh.update(grid, start, end, sc.maze_unit_size, sc.maze_wall_height, offset,
+                                  sc.maze_wall_thickness)
+    stats.count("tiles rebuilt", wall_mesh.rebuilt)
+    return arrays
+
+def redraw_edited_maze(sc, grid, start, end, stats):
+    """Redraw after an in-place edit; a solution on screen is solved again.
+
+    Returns False if the edit cut the start off from the end.
+    """
+    core   = _maze_core()
+    output = _maze_scene()
+    shown  = output.owned_objects(output.MAZE_COLLECTION).get(output.PATH)
+    solved = shown is not None and len(shown.data.polygons) > 0
+    arrays = patched_wall_arrays(sc, grid, start, end, stats) if sc.maze_output == 'MESH' else None
+    for _ in iter_maze_output(sc, grid, start, end, arrays, stats):
+        pass
+    if not solved:
+        return True
+    tree = maze_data["tree"]
+    key = None
+    try:
+        if tree is not None and tree.perfect:
+            # The patched index answers in O(path length)
+            with stats.phase("solve"):
+                path = tree.path(start, end)
+        else:
+            path, key = solve_job(core, get_solution_cache(sc), grid, start, end, sc.maze_solver,
+                                  maze_fingerprint(grid), stats, maze_data["costs"])
+    except core.NoRouteError:
+        return False
+    draw_path(path, sc.maze_unit_size, sc.maze_wall_height, (grid.width, grid.height), stats,
+              key, get_solution_cache(sc) if sc.maze_cache_meshes else None)
+    return True
+
+def iter_maze_output(sc, grid, start, end, arrays=None, stats=None):
+    """Build the walls as chosen in Output, yielding (done, total) progress."""
+    stats = stats or _maze_core().PhaseStats()
+    if sc.maze_output == 'MESH':
+        draw_3d_maze(grid, sc.maze_unit_size, sc.maze_wall_height, start, end, arrays, stats,
+                     sc.maze_wall_thickness)
+        yield 1, 1
+        return
+
+    materials = [get_material("MazeWallMat"), get_material("MazeEndMat")]
+    if sc.maze_output == 'TILES':
+        rebuilt = 0
+        tiles = _maze_scene().iter_maze_tiles(sc, grid, sc.maze_unit_size, sc.maze_wall_height,
+                                              start, end, sc.maze_tile_size, materials,
+                                              sc.maze_wall_thickness)
+        for rebuilt, done, total in stats.iterate("build tiles", tiles):
+            yield done, total
+        stats.count("tiles rebuilt", rebuilt)
+    else:
+        with stats.phase("build instances"):
+            obj = _maze_scene().draw_maze_instances(sc, grid, sc.maze_unit_size,
+                                                    sc.maze_wall_height, start, end,
+                                                    materials, sc.maze_wall_thickness)
+        stats.count("instances", len(obj.data.vertices))
+        yield 1, 1
+
+def generate_maze_job(core, algorithm, width, height, seed, braid, roughness, output,
+                      unit_size, wall_height, thickness, stats):
+    """The maze and, for Single Mesh, its arrays; the whole of a generate but the drawing.
+
+    BackgroundJob-safe. Braid and costs draw from their own maze_seeds
+    streams, as in maze_core.batch, so the same seed gives the same maze.
+    """
+    seeds = core.maze_seeds(seed)
+    with stats.phase("generate"):
+        grid, start, end = core.get_generator(algorithm)(width, height, seed=seeds[0])
+    if braid > 0:
+        with stats.phase("braid"):
+            core.braid_maze(grid, braid, seed=seeds[1])
+    costs = None
+    if roughness > 0:
+        with stats.phase("costs"):
+            costs = core.cost_plane(width, height, roughness, seed=seeds[2])
+    stats.count("cells", width * height)
+    arrays = None
+    if output == 'MESH':
+        with stats.phase("mesh arrays"):
+            arrays = wall_arrays(grid, unit_size, wall_height, start, end, thickness)
+    return grid, start, end, costs, arrays
+
+def solve_job(core, cache, grid, start, end, solver, fingerprint, stats, costs=None):
+    """Timed solve through the solution cache; returns (path, key). BackgroundJob-safe."""
+    with stats.phase("solve"):
+        path, key, hit = core.cached_solve(cache, grid, start, end, solver, fingerprint,
+                                           costs)
+    stats.count("solution cache hits", hit)
+    return path, key
+
+def count_solve(stats, solver, grid, path):
+    """Record the maze size and, for the algebraic solver, how much pruning removed."""
+    cells = grid.width * grid.height
+    stats.count("cells", cells)
+    if solver == 'algebraic':
+        stats.count("pruned cells", cells - len(path))
+
+def path_offset(path, unit_size):
+    """Vertex offset that centers the path's own bounds on the origin at z = 0.
+
+    This is where bounds-centering the path squares always left them, so the
+    maze size and wall height drop out.
+    """
+    if not path:
+        return (0.0, 0.0, 0.0)
+    xs = [x for x, _ in path]
+    ys = [y for _, y in path]
+    return (-(min(xs) + max(xs) + 1) * unit_size / 2,
+            -(min(ys) + max(ys) + 1) * unit_size / 2, 0.0)
+
+def draw_path(path, unit_size, wall_height, grid_size, stats=None, key=None, cache=None):
+    """Draw the solved path as flat blue faces, centered on the origin.
+
+    ``key`` is the solution's cache key: a path object already showing it is
+    left untouched, and with a ``cache`` the mesh arrays are reused across
+    solves. Paths drawn without a key (routes) clear the object's key.
+    """
+    core   = _maze_core()
+    output = _maze_scene()
+    stats  = stats or core.PhaseStats()
+
+    mesh_key = key and f"{key}/{unit_size}"
+    shown = output.owned_objects(output.MAZE_COLLECTION).get(output.PATH)
+    if mesh_key and shown is not None and shown.get(output.PATH_HASH_PROP) == mesh_key:
+        stats.count("path reused")
+        return
+
+    # Refill the path object of the last solve instead of adding another
+    path_mat = get_material("MazePathMat")
+    obj = output.ensure_object(bpy.context.scene, output.PATH, (path_mat,))
+
+    # Welded, upward-facing quads built straight from the cell list
+    arrays = cache.get(mesh_key) if cache is not None and mesh_key else None
+    if arrays is None:
+        with stats.phase("path mesh"):
+            arrays = core.build_path_mesh(path, unit_size, path_offset(path, unit_size))
+        if cache is not None and mesh_key:
+            cache.put(mesh_key, arrays)
+    verts, faces, material_indices = arrays
+    stats.count("path faces", len(faces))
+    with stats.phase("load path"):
+        output.load_mesh_arrays(obj.data, verts, faces, material_indices)
+    if mesh_key:
+        obj[output.PATH_HASH_PROP] = mesh_key
+    elif output.PATH_HASH_PROP in obj:
+        del obj[output.PATH_HASH_PROP]
+
+# -----------------------------------------------------------------------------
+# Operators
+# -----------------------------------------------------------------------------
+class GenerateMaze(bpy.types.Operator):
+    bl_idname = "mesh.generate_maze"
+    bl_label = "Create Lead Edge Ash"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        result, prof = profile_run(context.scene, self.run, context)
+        if prof:
+            self.report({'INFO'}, f"Profile written to {prof}")
+        return result
+
+    def run(self, context):
+        sc = context.scene
+        if not thickness_fits(self, sc):
+            return {'CANCELLED'}
+        stats = _maze_core().PhaseStats()
+        if sc.maze_random_seed:
+            # Remember the fresh seed so this exact maze can be rebuilt
+            sc.maze_seed = random.randrange(2**31)
+        grid, start, end, costs, arrays = generate_maze_job(
+            _maze_core(), sc.maze_algorithm, sc.maze_width, sc.maze_height, sc.maze_seed,
+            sc.maze_braid, sc.maze_cost_roughness, sc.maze_output, sc.maze_unit_size,
+            sc.maze_wall_height, sc.maze_wall_thickness, stats)
+        with stats.phase("store"):
+            store_maze(sc, grid, start, end, sc.maze_seed, costs=costs)
+        for _ in iter_maze_output(sc, grid, start, end, arrays, stats):
+            pass
+        publish_stats(self.bl_label, stats)
+        return {'FINISHED'}
+
+class SolveMaze(bpy.types.Operator):
+    bl_idname = "mesh.solve_maze"
+    bl_label = "Solve Lead Edge Ash"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        result, prof = profile_run(context.scene, self.run, context)
+        if prof:
+            self.report({'INFO'}, f"Profile written to {prof}")
+        return result
+
+    def run(self, context):
+        sc = context.scene
+        stats = _maze_core().PhaseStats()
+        with stats.phase("load maze"):
+            grid, start, end = load_maze(sc)
+        if grid is None:
+            self.report({'WARNING'}, "No maze to solve")
+            return {'CANCELLED'}
+        cache = get_solution_cache(sc)
+        try:
+            path, key = solve_job(_maze_core(), cache, grid, start, end, sc.maze_solver,
+                                  maze_fingerprint(grid), stats, maze_data["costs"])
+        except _maze_core().NoRouteError as exc:
+            self.report({'ERROR'}, str(exc))
+            return {'CANCELLED'}
+        count_solve(stats, sc.maze_solver, grid, path)
+        draw_path(path, sc.maze_unit_size, sc.maze_wall_height,
+                  (grid.width, grid.height), stats,
+                  key, cache if sc.maze_cache_meshes else None)
+        publish_stats(self.bl_label, stats)
+        return {'FINISHED'}
+
+class PickRouteEndpoint(bpy.types.Operator):
+    """Set a route endpoint or edit region corner to the maze cell under the 3D cursor"""
+    bl_idname = "mesh.pick_maze_route_endpoint"
+    bl_label = "Pick Maze Cell"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    endpoint: bpy.props.EnumProperty(
+        items=[('START', "From", "Set the route start"), ('END', "To", "Set the route end"),
+               ('REGION_MIN', "Region Min", "Set the first corner of the edit region"),
+               ('REGION_MAX', "Region Max", "Set the opposite corner of the edit region")])
+
+    def execute(self, context):
+        sc = context.scene
+        grid, _, _ = load_maze(sc)
+        if grid is None:
+            self.report({'WARNING'}, "No maze to pick from")
+            return {'CANCELLED'}
+        cell = _maze_scene().cell_at(sc.cursor.location, grid.width, grid.height,
+                                     sc.maze_unit_size, sc.maze_wall_height)
+        if cell is None:
+            self.report({'WARNING'}, "The 3D cursor is not over the maze")
+            return {'CANCELLED'}
+        if self.endpoint == 'START':
+            sc.maze_route_start = cell
+        elif self.endpoint == 'END':
+            sc.maze_route_end = cell
+        elif self.endpoint == 'REGION_MIN':
+            sc.maze_region_min = cell
+        else:
+            sc.maze_region_max = cell
+        return {'FINISHED'}
+
+class SolveMazeRoute(bpy.types.Operator):
+    """Draw the route between the From and To cells using the maze's tree index"""
+    bl_idname = "mesh.solve_maze_route"
+    bl_label = "Solve Route"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        result, prof = profile_run(context.scene, self.run, context)
+        if prof:
+            self.report({'INFO'}, f"Profile written to {prof}")
+        return result
+
+    def run(self, context):
+        sc = context.scene
+        stats = _maze_core().PhaseStats()
+        with stats.phase("load maze"):
+            grid, _, _ = load_maze(sc)
+        if grid is None:
+            self.report({'WARNING'}, "No maze to solve")
+            return {'CANCELLED'}
+        # Built on the first route of a maze, then every route is O(log n + length).
+        # Braided mazes have loops the tree cannot see, so they use the selected solver.
+        tree = maze_tree(sc, stats)
+        route = tree.path if tree.perfect else (
+            lambda a, b: _maze_core().get_solver(sc.maze_solver, maze_data["costs"])(grid, a, b))
+        try:
+            with stats.phase("route"):
+                path = route(tuple(sc.maze_route_start), tuple(sc.maze_route_end))
+        except ValueError as exc:
+            self.report({'ERROR'}, str(exc))
+            return {'CANCELLED'}
+        stats.count("route cells", len(path))
+        draw_path(path, sc.maze_unit_size, sc.maze_wall_height,
+                  (grid.width, grid.height), stats)
+        publish_stats(self.bl_label, stats)
+        self.report({'INFO'}, f"Route: {len(path) - 1} steps")
+        return {'FINISHED'}
+
+class ToggleMazeWall(bpy.types.Operator):
+    """Knock out or rebuild the wall between two adjacent cells, patching only what it touches"""
+    bl_idname = "mesh.toggle_maze_wall"
+    bl_label = "Toggle Wall"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    use_cursor: bpy.props.BoolProperty(name="At 3D Cursor", default=True,
+                                       description="Toggle the interior wall nearest the 3D cursor")
+    cell_a: bpy.props.IntVectorProperty(name="Cell", size=2, min=0)
+    cell_b: bpy.props.IntVectorProperty(name="Neighbor", size=2, min=0)
+
+    def execute(self, context):
+        result, prof = profile_run(context.scene, self.run, context)
+        if prof:
+            self.report({'INFO'}, f"Profile written to {prof}")
+        return result
+
+    def run(self, context):
+        sc = context.scene
+        core = _maze_core()
+        stats = core.PhaseStats()
+        if maze_busy():
+            self.report({'WARNING'}, "Wait for the background job to finish before editing")
+            return {'CANCELLED'}
+        with stats.phase("load maze"):
+            grid, start, end = load_maze(sc)
+        if grid is None:
+            self.report({'WARNING'}, "No maze to edit")
+            return {'CANCELLED'}
+        if self.use_cursor:
+            wall = _maze_scene().wall_at(sc.cursor.location, grid.width, grid.height,
+                                         sc.maze_unit_size, sc.maze_wall_height)
+            if wall is None:
+                self.report({'WARNING'}, "The 3D cursor is not near an interior wall")
+                return {'CANCELLED'}
+            self.cell_a, self.cell_b = wall
+        a, b = tuple(self.cell_a), tuple(self.cell_b)
+        # An index that was never built stays unbuilt; one that was is patched
+        tree = maze_data["tree"]
+        try:
+            with stats.phase("edit"):
+                present = core.toggle_wall(grid, a, b, tree)
+        except ValueError as exc:
+            self.report({'ERROR'}, str(exc))
+            return {'CANCELLED'}
+        with stats.phase("store"):
+            store_maze(sc, grid, start, end, tree=tree, costs=maze_data["costs"])
+        connected = redraw_edited_maze(sc, grid, start, end, stats)
+        publish_stats(self.bl_label, stats)
+        self.report({'INFO'}, f"Wall {'added' if present else 'removed'} between {a} and {b}")
+        if not connected:
+            self.report({'WARNING'}, f"{end} is no longer reachable from {start}")
+        return {'FINISHED'}
+
+class RegenerateMazeRegion(bpy.types.Operator):
+    """Replace the walls inside the edit region with a fresh sub-maze, keeping the maze perfect"""
+    bl_idname = "mesh.regenerate_maze_region"
+    bl_label = "Regenerate Region"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        result, prof = profile_run(context.scene, self.run, context)
+        if prof:
+            self.report({'INFO'}, f"Profile written to {prof}")
+        return result
+
+    def run(self, context):
+        sc = context.scene
+        core = _maze_core()
+        stats = core.PhaseStats()
+        if maze_busy():
+            self.report({'WARNING'}, "Wait for the background job to finish before editing")
+            return {'CANCELLED'}
+        with stats.phase("load maze"):
+            grid, start, end = load_maze(sc)
+        if grid is None:
+            self.report({'WARNING'}, "No maze to edit")
+            return {'CANCELLED'}
+        (ax, ay), (bx, by) = sc.maze_region_min, sc.maze_region_max
+        region = (min(ax, bx), min(ay, by), max(ax, bx) + 1, max(ay, by) + 1)
+        # The region's doors are chosen from the tree index, so build it if needed
+        tree = maze_tree(sc, stats)
+        seed = random.randrange(2**31) if sc.maze_random_seed else sc.maze_seed
+        try:
+            with stats.phase("edit"):
+                core.regenerate_region(grid, region, seed, sc.maze_algorithm, tree)
+        except ValueError as exc:
+            self.report({'ERROR'}, str(exc))
+            return {'CANCELLED'}
+        stats.count("cells", (region[2] - region[0]) * (region[3] - region[1]))
+        with stats.phase("store"):
+            store_maze(sc, grid, start, end, tree=tree, costs=maze_data["costs"])
+        redraw_edited_maze(sc, grid, start, end, stats)
+        publish_stats(self.bl_label, stats)
+        return {'FINISHED'}
+
+class MazeModalMixin:
+    """Timer-driven modal loop shared by the background operators.
+
+    Subclasses start a BackgroundJob in ``start_job`` and turn its result
+    into a generator of (done, total) main-thread build steps in
+    ``build_steps``; the mixin polls the job, runs the steps in short time
+    slices, shows progress in the header and cancels on Esc. Subclasses
+    whose job reads the stored grid set ``reads_maze``, which holds off wall
+    edits until the worker is done.
+    """
+    reads_maze = False
+    _timer = None
+    _job = None
+    _steps = None
+    _area = None
+    _stats = None
+
+    def invoke(self, context, event):
+        # Filled by the worker first, then by the main-thread build steps
+        self._stats = _maze_core().PhaseStats()
+        self._job = self.start_job(context)
+        if self._job is None:
+            return {'CANCELLED'}
+        track_job(self._job, self.reads_maze)
+        self._steps = None
+        self._area = context.area
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.05, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, 100)
+        self.set_status(f"{self.bl_label}: working... (Esc to cancel)")
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.finish(context)
+            self.report({'WARNING'}, f"{self.bl_label} cancelled")
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        if self._steps is None:
+            if not self._job.done:
+                return {'RUNNING_MODAL'}
+            try:
+                self._steps = self.build_steps(context, self._job.result())
+            except Exception as exc:
+                self.finish(context)
+                self.report({'ERROR'}, f"{self.bl_label} failed: {exc}")
+                return {'CANCELLED'}
+
+        try:
+            progress = _maze_scene().run_time_slice(self._steps)
+        except Exception as exc:
+            self.finish(context)
+            self.report({'ERROR'}, f"{self.bl_label} failed: {exc}")
+            return {'CANCELLED'}
+        if progress is None:
+            self.finish(context)
+            publish_stats(self.bl_label, self._stats)
+            return {'FINISHED'}
+        done, total = progress
+        context.window_manager.progress_update(int(100 * done / total))
+        self.set_status(f"{self.bl_label}: building {done}/{total} (Esc to cancel)")
+        return {'RUNNING_MODAL'}
+
+    def set_status(self, text):
+        if self._area is not None:
+            self._area.header_text_set(text)
+
+    def finish(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        self.set_status(None)
+
+class GenerateMazeModal(MazeModalMixin, bpy.types.Operator):
+    """Generate the maze on a worker thread and build it without freezing the UI"""
+    bl_idname = "mesh.generate_maze_modal"
+    bl_label = "Create Lead Edge Ash (Background)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def start_job(self, context):
+        sc = context.scene
+        if not thickness_fits(self, sc):
+            return None
+        if sc.maze_random_seed:
+            sc.maze_seed = random.randrange(2**31)
+        return _maze_scene().BackgroundJob(
+            generate_maze_job, _maze_core(), sc.maze_algorithm, sc.maze_width,
+            sc.maze_height, sc.maze_seed, sc.maze_braid, sc.maze_cost_roughness, sc.maze_output,
+            sc.maze_unit_size, sc.maze_wall_height, sc.maze_wall_thickness, self._stats)
+
+    def build_steps(self, context, result):
+        sc = context.scene
+        grid, start, end, costs, arrays = result
+        with self._stats.phase("store"):
+            store_maze(sc, grid, start, end, sc.maze_seed, costs=costs)
+        return iter_maze_output(sc, grid, start, end, arrays, self._stats)
+
+class SolveMazeModal(MazeModalMixin, bpy.types.Operator):
+    """Solve the maze on a worker thread without freezing the UI"""
+    bl_idname = "mesh.solve_maze_modal"
+    bl_label = "Solve Lead Edge Ash (Background)"
+    bl_options = {'REGISTER', 'UNDO'}
+    reads_maze = True
+
+    def start_job(self, context):
+        sc = context.scene
+        grid, start, end = load_maze(sc)
+        if grid is None:
+            self.report({'WARNING'}, "No maze to solve")
+            return None
+        return _maze_scene().BackgroundJob(
+            solve_job, _maze_core(), get_solution_cache(sc), grid, start, end,
+            sc.maze_solver, maze_fingerprint(grid), self._stats, maze_data["costs"])
+
+    def build_steps(self, context, result):
+        sc = context.scene
+        path, key = result
+        grid, _, _ = load_maze(sc)
+        count_solve(self._stats, sc.maze_solver, grid, path)
+        draw_path(path, sc.maze_unit_size, sc.maze_wall_height,
+                  (grid.width, grid.height), self._stats,
+                  key, get_solution_cache(sc) if sc.maze_cache_meshes else None)
+        yield 1, 1
+
+class ClearMaze(bpy.types.Operator):
+    bl_idname = "object.clear_maze"
+    bl_label = "Clear Maze & Path"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        clear_maze_and_path()
+        return {'FINISHED'}
+
+
+# -----------------------------------------------------------------------------
+# Panel sections
+# -----------------------------------------------------------------------------
+def draw_settings(layout, sc):
+    """Maze size, generator, output and solver settings."""
+    layout.prop(sc, "maze_width")
+    layout.prop(sc, "maze_height")
+    layout.prop(sc, "maze_unit_size")
+    layout.prop(sc, "maze_wall_height")
+    layout.prop(sc, "maze_algorithm")
+    layout.prop(sc, "maze_braid", slider=True)
+    layout.prop(sc, "maze_cost_roughness")
+    row = layout.row(align=True)
+    row.prop(sc, "maze_seed")
+    row.prop(sc, "maze_random_seed", text="", icon='FILE_REFRESH')
+    layout.prop(sc, "maze_output")
+    if sc.maze_output == 'TILES':
+        layout.prop(sc, "maze_tile_size")
+    layout.prop(sc, "maze_wall_thickness")
+    layout.prop(sc, "maze_solver")
+    row = layout.row(align=True)
+    row.prop(sc, "maze_cache_mb")
+    row.prop(sc, "maze_cache_meshes", text="", icon='MESH_DATA')
+
+def draw_routes_and_edits(layout, sc):
+    """Route endpoints and the wall edit tools, one box each."""
+    box = layout.box()
+    for prop, endpoint in (("maze_route_start", 'START'), ("maze_route_end", 'END')):
+        row = box.row(align=True)
+        row.prop(sc, prop)
+        row.operator("mesh.pick_maze_route_endpoint", text="",
+                     icon='PIVOT_CURSOR').endpoint = endpoint
+    box.operator("mesh.solve_maze_route")
+    box = layout.box()
+    box.operator("mesh.toggle_maze_wall", icon='MOD_BUILD')
+    for prop, corner in (("maze_region_min", 'REGION_MIN'), ("maze_region_max", 'REGION_MAX')):
+        row = box.row(align=True)
+        row.prop(sc, prop)
+        row.operator("mesh.pick_maze_route_endpoint", text="",
+                     icon='PIVOT_CURSOR').endpoint = corner
+    box.operator("mesh.regenerate_maze_region", icon='FILE_REFRESH')
+
+def draw_stats(layout, sc):
+    """Timings of the last run and the profiling toggle."""
+    stats = maze_stats["stats"]
+    if stats is not None:
+        box = layout.box()
+        box.label(text=f"{maze_stats['operator']}: {stats.total:.3f} s", icon='TIME')
+        col = box.column(align=True)
+        for line in stats.summary():
+            col.label(text=line)
+    row = layout.row(align=True)
+    row.prop(sc, "maze_profile", icon='REC')
+    row.prop(sc, "maze_profile_path", text="")
+
+# -----------------------------------------------------------------------------
+# Registration
+# -----------------------------------------------------------------------------
+CLASSES = (
+    GenerateMaze,
+    SolveMaze,
+    GenerateMazeModal,
+    SolveMazeModal,
+    PickRouteEndpoint,
+    SolveMazeRoute,
+    ToggleMazeWall,
+    RegenerateMazeRegion,
+    ClearMaze,
+)
+
+def register(solver='bfs'):
+    """Register the shared operators and scene properties; ``solver`` is the default Solver."""
+    for cls in CLASSES:
+        bpy.utils.register_class(cls)
+
+    bpy.types.Scene.maze_width         = bpy.props.IntProperty(name="Width",       default=10, min=1)
+    bpy.types.Scene.maze_height        = bpy.props.IntProperty(name="Height",      default=10, min=1)
+    bpy.types.Scene.maze_unit_size     = bpy.props.FloatProperty(name="Unit Size",   default=1.0)
+    bpy.types.Scene.maze_wall_height   = bpy.props.FloatProperty(name="Wall Height", default=2.0)
+    bpy.types.Scene.maze_algorithm     = bpy.props.EnumProperty(
+        name="Algorithm", items=MAZE_ALGORITHMS, default='backtracker',
+        description="Maze generation algorithm"
+    )
+    bpy.types.Scene.maze_braid         = bpy.props.FloatProperty(
+        name="Braid", default=0.0, min=0.0, max=1.0, subtype='FACTOR',
+        description="Fraction of dead ends opened up into loops (0 = perfect maze)"
+    )
+    bpy.types.Scene.maze_cost_roughness = bpy.props.FloatProperty(
+        name="Terrain Costs", default=0.0, min=0.0,
+        description="Per-cell step costs from 1 to 1 + this for the Dijkstra solver (0 = uniform)"
+    )
+    bpy.types.Scene.maze_seed          = bpy.props.IntProperty(
+        name="Seed", default=0, min=0,
+        description="Random seed; the same seed, size and algorithm rebuild the same maze"
+    )
+    bpy.types.Scene.maze_random_seed   = bpy.props.BoolProperty(
+        name="Random Seed", default=True,
+        description="Pick a new seed on every generate and store it in Seed"
+    )
+    bpy.types.Scene.maze_output        = bpy.props.EnumProperty(
+        name="Output", items=MAZE_OUTPUTS, default='MESH',
+        description="How the maze walls are turned into Blender objects"
+    )
+    bpy.types.Scene.maze_tile_size     = bpy.props.IntProperty(
+        name="Tile Size", default=64, min=1,
+        description="Cells per side of each tile object"
+    )
+    bpy.types.Scene.maze_wall_thickness = bpy.props.FloatProperty(
+        name="Wall Thickness", default=0.0, min=0.0,
+        description="Build walls as closed boxes this thick (0 = single-sided panels)"
+    )
+    bpy.types.Scene.maze_solver        = bpy.props.EnumProperty(
+        name="Solver", items=MAZE_SOLVERS, default=solver,
+        description="Algorithm used by Solve; reports when the end is unreachable"
+    )
+    bpy.types.Scene.maze_cache_mb      = bpy.props.IntProperty(
+        name="Solution Cache (MB)", default=64, min=0,
+        description="Memory for remembered solutions; re-solving an unchanged maze is instant (0 = off)"
+    )
+    bpy.types.Scene.maze_cache_meshes  = bpy.props.BoolProperty(
+        name="Cache Path Meshes", default=True,
+        description="Also keep the built path meshes in the solution cache"
+    )
+    bpy.types.Scene.maze_route_start   = bpy.props.IntVectorProperty(
+        name="From", size=2, min=0,
+        description="Cell (x, y) the route starts at"
+    )
+    bpy.types.Scene.maze_route_end     = bpy.props.IntVectorProperty(
+        name="To", size=2, min=0,
+        description="Cell (x, y) the route ends at"
+    )
+    bpy.types.Scene.maze_region_min    = bpy.props.IntVectorProperty(
+        name="Region Min", size=2, min=0,
+        description="One corner cell (x, y) of the region Regenerate Region rebuilds"
+    )
+    bpy.types.Scene.maze_region_max    = bpy.props.IntVectorProperty(
+        name="Region Max", size=2, min=0, default=(7, 7),
+        description="Opposite corner cell (x, y) of the region, inclusive"
+    )
+    bpy.types.Scene.maze_profile       = bpy.props.BoolProperty(
+        name="Profile Next Run", default=False,
+        description="Capture the next Create/Solve with cProfile and write a .prof file"
+    )
+    bpy.types.Scene.maze_profile_path  = bpy.props.StringProperty(
+        name="Profile File", default="//lead_edge_maze.prof", subtype='FILE_PATH',
+        description="Where the cProfile dump is written (open with snakeviz or pstats)"
+    )
+
+def unregister():
+    for cls in reversed(CLASSES):
+        bpy.utils.unregister_class(cls)
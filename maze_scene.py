@@ -0,0 +1,384 @@
+"""Blender-side maze output shared by the Lead Edge addons.
+
+Like maze_core this module is only imported when an operator first needs it,
+so registering the addons stays cheap.
+"""
+import math
+import threading
+import time
+
+import bpy
+import numpy as np
+
+try:
+    from . import maze_core
+except ImportError:  # installed as a single-file addon next to maze_core
+    import maze_core
+
+# Every object the addon creates lives in one of these collections and is
+# tagged with its role, so it is found again without scanning bpy.data.
+MAZE_COLLECTION = "LeadEdgeMaze"
+TILE_COLLECTION = "MazeTiles"
+ROLE_PROP = "lead_edge_role"
+TILE_HASH_PROP = "lead_edge_tile_hash"
+# Solution key (maze_core.solution_key plus unit size) the path mesh shows
+PATH_HASH_PROP = "lead_edge_path_hash"
+
+# Roles in MAZE_COLLECTION (also the names the objects are created with)
+WALLS = "Maze"
+PATH = "MazePath"
+INSTANCES = "MazeInstances"
+PROTOTYPES = ("MazeWallUnit", "MazeEndUnit")
+
+# -----------------------------------------------------------------------------
+# Mesh data
+# -----------------------------------------------------------------------------
+def load_mesh_arrays(mesh, verts, faces, material_indices):
+    """Fill an empty mesh from (N,3) vertex, (F,4) quad and (F,) material arrays."""
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, 4, dtype=np.int32))
+    mesh.polygons.foreach_set("material_index", material_indices)
+    mesh.update(calc_edges=True)
+
+def maze_placement(width, height, unit_size, wall_height):
+    """(vertex offset, object location) every maze output is built with.
+
+    Reproduces where the original bounds-centering left the single mesh:
+    geometry centered on the object origin, object shifted by half the maze.
+    """
+    offset = (-width * unit_size / 2, -height * unit_size / 2, -wall_height / 2)
+    location = (-width * unit_size / 2, -height * unit_size / 2, 0)
+    return offset, location
+
+def cell_at(point, width, height, unit_size, wall_height):
+    """Maze cell (x, y) under a world-space point, or None outside the maze.
+
+    Assumes the maze objects still sit where maze_placement put them.
+    """
+    offset, location = maze_placement(width, height, unit_size, wall_height)
+    x = math.floor((point[0] - location[0] - offset[0]) / unit_size)
+    y = math.floor((point[1] - location[1] - offset[1]) / unit_size)
+    if 0 <= x < width and 0 <= y < height:
+        return x, y
+    return None
+
+def wall_at(point, width, height, unit_size, wall_height):
+    """The two cells either side of the interior wall nearest a world-space point.
+
+    Returns ``(cell, neighbor)``, or None off the maze or nearest the border.
+    """
+    offset, location = maze_placement(width, height, unit_size, wall_height)
+    fx = (point[0] - location[0] - offset[0]) / unit_size
+    fy = (point[1] - location[1] - offset[1]) / unit_size
+    x, y = math.floor(fx), math.floor(fy)
+    if not (0 <= x < width and 0 <= y < height):
+        return None
+    dx, dy = fx - x - 0.5, fy - y - 0.5
+    if abs(dx) >= abs(dy):
+        neighbor = (x + (1 if dx > 0 else -1), y)
+    else:
+        neighbor = (x, y + (1 if dy > 0 else -1))
+    if not (0 <= neighbor[0] < width and 0 <= neighbor[1] < height):
+        return None
+    return (x, y), neighbor
+
+def get_collection(name, scene):
+    """Get or create a collection linked directly under the scene collection."""
+    coll = bpy.data.collections.get(name)
+    if coll is None:
+        coll = bpy.data.collections.new(name)
+    if scene.collection.children.get(coll.name) is None:
+        scene.collection.children.link(coll)
+    return coll
+
+# -----------------------------------------------------------------------------
+# Addon-owned objects
+# -----------------------------------------------------------------------------
+def owned_objects(collection=MAZE_COLLECTION):
+    """{role: object} for the addon objects in one of its collections."""
+    coll = bpy.data.collections.get(collection)
+    if coll is None:
+        return {}
+    return {obj[ROLE_PROP]: obj for obj in coll.objects if ROLE_PROP in obj}
+
+def ensure_object(scene, role, materials=(), collection=MAZE_COLLECTION, owned=None):
+    """Return the mesh object playing ``role`` with its geometry cleared.
+
+    Object and mesh are created the first time only; later calls hand back
+    the same datablocks, so regenerating allocates nothing new. ``owned`` is
+    an owned_objects() result to reuse when looking up many roles.
+    """
+    if owned is None:
+        owned = owned_objects(collection)
+    obj = owned.get(role)
+    if obj is None:
+        mesh = bpy.data.meshes.new(role)
+        obj = bpy.data.objects.new(role, mesh)
+        obj[ROLE_PROP] = role
+        get_collection(collection, scene).objects.link(obj)
+    else:
+        mesh = obj.data
+        mesh.clear_geometry()
+    if list(mesh.materials) != list(materials):
+        mesh.materials.clear()
+        for mat in materials:
+            mesh.materials.append(mat)
+    return obj
+
+def remove_object(obj):
+    """Delete an object and its mesh once nothing else uses it."""
+    mesh = obj.data
+    bpy.data.objects.remove(obj, do_unlink=True)
+    if mesh is not None and mesh.users == 0:
+        bpy.data.meshes.remove(mesh)
+
+def reset_outputs(keep=(), keep_tiles=False):
+    """Make room for a new maze: drop other outputs' objects, empty the path.
+
+    Roles in ``keep`` are left for the caller to refill in place.
+    """
+    for role, obj in owned_objects(MAZE_COLLECTION).items():
+        if role == PATH:
+            obj.data.clear_geometry()
+            if PATH_HASH_PROP in obj:
+                del obj[PATH_HASH_PROP]
+        elif role not in keep:
+            remove_object(obj)
+    if not keep_tiles:
+        for obj in owned_objects(TILE_COLLECTION).values():
+            remove_object(obj)
+
+def clear_maze_objects():
+    """Remove every object (and mesh) the addon has created."""
+    for collection in (MAZE_COLLECTION, TILE_COLLECTION):
+        for obj in owned_objects(collection).values():
+            remove_object(obj)
+
+# -----------------------------------------------------------------------------
+# Tiled output
+# -----------------------------------------------------------------------------
+def tile_name(tx, ty):
+    return f"MazeTile_{tx}_{ty}"
+
+def iter_maze_tiles(scene, grid, unit_size, wall_height, start, end, tile_size, materials,
+                    thickness=0.0):
+    """Build the maze as one mesh object per tile inside the MazeTiles collection.
+
+    Tiles whose walls and build settings are unchanged since the last call
+    keep their mesh untouched; only changed tiles are refilled in place.
+    Vertices use the same frame as draw_3d_maze, so a tiled maze lands
+    exactly where the single-object maze would. Turns on Cycles camera
+    culling for the scene and the tiles. A generator, so modal
+    operators can build in time slices: yields ``(rebuilt, done, total)``
+    after every tile.
+    """
+    grid = maze_core.as_maze_grid(grid)
+    width, height = grid.width, grid.height
+    offset, location = maze_placement(width, height, unit_size, wall_height)
+
+    reset_outputs(keep_tiles=True)
+    tiles = list(maze_core.iter_tiles(width, height, tile_size))
+    owned = owned_objects(TILE_COLLECTION)
+    wanted = {tile_name(tx, ty) for tx, ty, _ in tiles}
+    # Drop tiles left over from a larger maze
+    for role in set(owned) - wanted:
+        remove_object(owned.pop(role))
+
+    # Let Cycles skip tiles outside the camera view. The per-object flag only
+    # takes effect with the scene's Camera Culling simplify option, which
+    # only touches objects that opted in, so switch both on together.
+    cull = hasattr(scene, "cycles") and hasattr(scene.cycles, "use_camera_cull")
+    if cull:
+        scene.cycles.use_camera_cull = True
+
+    rebuilt = 0
+    for done, (tx, ty, region) in enumerate(tiles, 1):
+        name = tile_name(tx, ty)
+        fingerprint = maze_core.tile_fingerprint(grid, start, end, region,
+                                                 unit_size, wall_height, thickness,
+                                                 width, height)
+        obj = owned.get(name)
+        if obj is not None and obj.get(TILE_HASH_PROP) == fingerprint:
+            yield rebuilt, done, len(tiles)
+            continue
+
+        obj = ensure_object(scene, name, materials, TILE_COLLECTION, owned)
+        if cull:
+            obj.cycles.use_camera_cull = True
+
+        verts, faces, material_indices = maze_core.build_wall_mesh(
+            grid, unit_size, wall_height, start, end, region=region, offset=offset,
+            thickness=thickness)
+        load_mesh_arrays(obj.data, verts, faces, material_indices)
+        obj.location = location
+        obj[TILE_HASH_PROP] = fingerprint
+        rebuilt += 1
+        yield rebuilt, done, len(tiles)
+
+# -----------------------------------------------------------------------------
+# Instanced output
+# -----------------------------------------------------------------------------
+INSTANCER_GROUP = "MazeWallInstancer"
+
+def _wall_prototype(scene, role, unit_size, wall_height, thickness, material):
+    """Single wall panel (or box when thick) centered on X at the origin."""
+    obj = ensure_object(scene, role, (material,))
+    u = unit_size / 2
+    if thickness > 0:
+        t = thickness / 2
+        verts = [(-u, -t, 0), (u, -t, 0), (u, t, 0), (-u, t, 0),
+                 (-u, -t, wall_height), (u, -t, wall_height),
+                 (u, t, wall_height), (-u, t, wall_height)]
+        faces = [(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+                 (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)]
+    else:
+        verts = [(-u, 0, 0), (u, 0, 0), (u, 0, wall_height), (-u, 0, wall_height)]
+        faces = [(0, 1, 2, 3)]
+    obj.data.from_pydata(verts, [], faces)
+    bevel = obj.modifiers.get("Bevel")
+    if thickness > 0:
+        # Evaluated once on the prototype, shared by every instance
+        if bevel is None:
+            bevel = obj.modifiers.new(name="Bevel", type='BEVEL')
+        bevel.width = thickness * 0.25
+        bevel.segments = 2
+    elif bevel is not None:
+        obj.modifiers.remove(bevel)
+    obj.hide_viewport = True
+    obj.hide_render = True
+    return obj
+
+def _instancer_group(prototypes):
+    """Geometry Nodes group: instance wall/end prototypes on the maze points.
+
+    Built once; later calls only point its Object Info nodes (named after
+    the prototype roles) at the current ``prototypes`` ({role: object}).
+    """
+    group = bpy.data.node_groups.get(INSTANCER_GROUP)
+    if group is not None:
+        for role, proto in prototypes.items():
+            group.nodes[role].inputs["Object"].default_value = proto
+        return group
+    group = bpy.data.node_groups.new(INSTANCER_GROUP, 'GeometryNodeTree')
+    group.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    group.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    nodes, links = group.nodes, group.links
+
+    group_in = nodes.new('NodeGroupInput')
+    group_out = nodes.new('NodeGroupOutput')
+    rotation = nodes.new('GeometryNodeInputNamedAttribute')
+    rotation.data_type = 'FLOAT_VECTOR'
+    rotation.inputs["Name"].default_value = "rotation"
+    terminal = nodes.new('GeometryNodeInputNamedAttribute')
+    terminal.data_type = 'BOOLEAN'
+    terminal.inputs["Name"].default_value = "terminal"
+    is_wall = nodes.new('FunctionNodeBooleanMath')
+    is_wall.operation = 'NOT'
+    join = nodes.new('GeometryNodeJoinGeometry')
+    links.new(terminal.outputs["Attribute"], is_wall.inputs[0])
+
+    for selection, role in ((is_wall.outputs[0], PROTOTYPES[0]),
+                            (terminal.outputs["Attribute"], PROTOTYPES[1])):
+        info = nodes.new('GeometryNodeObjectInfo')
+        info.name = role
+        info.inputs["Object"].default_value = prototypes[role]
+        instance = nodes.new('GeometryNodeInstanceOnPoints')
+        links.new(group_in.outputs[0], instance.inputs["Points"])
+        links.new(selection, instance.inputs["Selection"])
+        links.new(info.outputs["Geometry"], instance.inputs["Instance"])
+        links.new(rotation.outputs["Attribute"], instance.inputs["Rotation"])
+        links.new(instance.outputs["Instances"], join.inputs[0])
+    links.new(join.outputs[0], group_out.inputs[0])
+    return group
+
+def _point_attribute(mesh, name, data_type):
+    attribute = mesh.attributes.get(name)
+    if attribute is None:
+        attribute = mesh.attributes.new(name, data_type, 'POINT')
+    return attribute
+
+def draw_maze_instances(scene, grid, unit_size, wall_height, start, end, materials,
+                        thickness=0.0):
+    """Build the maze as one point per wall instanced by Geometry Nodes.
+
+    Memory and build time scale with a position, a rotation and a flag per
+    wall; the wall panel itself (optionally a thick beveled box) exists once.
+    The instances land where draw_3d_maze would put the walls.
+    """
+    grid = maze_core.as_maze_grid(grid)
+    width, height = grid.width, grid.height
+    offset, location = maze_placement(width, height, unit_size, wall_height)
+    positions, rotations, terminal = maze_core.wall_instances(
+        grid, start, end, unit_size, offset)
+
+    reset_outputs(keep=(INSTANCES,) + PROTOTYPES)
+    owned = owned_objects()
+    prototypes = {role: _wall_prototype(scene, role, unit_size, wall_height, thickness, mat)
+                  for role, mat in zip(PROTOTYPES, materials)}
+
+    obj = ensure_object(scene, INSTANCES, owned=owned)
+    mesh = obj.data
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", positions.ravel())
+    _point_attribute(mesh, "rotation", 'FLOAT_VECTOR').data.foreach_set(
+        "vector", rotations.ravel())
+    _point_attribute(mesh, "terminal", 'BOOLEAN').data.foreach_set(
+        "value", terminal)
+    mesh.update()
+
+    modifier = obj.modifiers.get("Wall Instances")
+    if modifier is None:
+        modifier = obj.modifiers.new(name="Wall Instances", type='NODES')
+    modifier.node_group = _instancer_group(prototypes)
+    obj.location = location
+    return obj
+
+# -----------------------------------------------------------------------------
+# Background jobs
+# -----------------------------------------------------------------------------
+class BackgroundJob:
+    """Run a pure maze_core function on a worker thread.
+
+    The modal operators poll ``done`` from their timer events and pick up
+    ``result()`` on the main thread, where all bpy calls must happen.
+    Cancelling only detaches from the job; the worker finishes on its own and
+    its result is dropped.
+    """
+
+    def __init__(self, func, *args, **kwargs):
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(func, args, kwargs),
+                                        name="LeadEdgeMazeJob", daemon=True)
+        self._thread.start()
+
+    def _run(self, func, args, kwargs):
+        try:
+            self._result = func(*args, **kwargs)
+        except Exception as exc:  # re-raised on the main thread by result()
+            self._error = exc
+
+    @property
+    def done(self):
+        return not self._thread.is_alive()
+
+    def result(self):
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+def run_time_slice(steps, budget=0.03):
+    """Advance a generator for at most ``budget`` seconds.
+
+    Returns the last value it yielded, or None once it is exhausted.
+    """
+    deadline = time.perf_counter() + budget
+    value = None
+    for value in steps:
+        if time.perf_counter() >= deadline:
+            return value
+    return None
@@ -0,0 +1,12 @@
+"""Make maze_core importable without importing the Blender addon around it.
+
+The repository root is itself the addon package (its ``__init__.py`` needs
+bpy), so the tests put the root on ``sys.path`` and import ``maze_core`` as a
+top-level package, the same way the batch CLI and benchmarks run. Run them
+with ``python -m pytest tests`` (tests/pytest.ini keeps pytest out of the
+addon package).
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
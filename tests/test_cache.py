@@ -0,0 +1,75 @@
+import threading
+
+import numpy as np
+
+from maze_core import LRUCache, braid_maze, cached_solve, cost_plane, get_generator
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = LRUCache(max_bytes=64 * 3)
+    for key in "abc":
+        cache.put(key, np.zeros(8, dtype=np.int64))
+    assert cache.get("a") is not None
+    cache.put("d", np.zeros(8, dtype=np.int64))
+    assert "b" not in cache
+    assert all(key in cache for key in "acd")
+    cache.put("e", np.zeros(16, dtype=np.int64))
+    assert "c" not in cache and "a" not in cache
+    assert len(cache) == 2 and cache.nbytes == 64 * 3
+    # A value over the whole budget is dropped rather than emptying the cache
+    cache.put("f", np.zeros(32, dtype=np.int64))
+    assert "f" not in cache and len(cache) == 2
+    cache.set_limit(128)
+    assert "d" not in cache and "e" in cache and cache.nbytes == 128
+
+
+def test_cached_solve_hits_after_a_miss():
+    grid, start, end = get_generator("backtracker")(20, 20, seed=4)
+    cache = LRUCache()
+    path, key, hit = cached_solve(cache, grid, start, end)
+    assert not hit and key in cache and cache.misses == 1
+    again, again_key, hit = cached_solve(cache, grid, start, end)
+    assert hit and again_key == key and again == path and cache.hits == 1
+    assert cached_solve(cache, grid, end, start)[2] is False
+
+
+
+def test_only_weighted_solves_are_keyed_by_costs():
+    grid, start, end = get_generator("backtracker")(40, 30, seed=2)
+    braid_maze(grid, 1.0, seed=2)
+    costs = cost_plane(40, 30, 20.0, seed=2)
+    cache = LRUCache()
+    plain, plain_key, _ = cached_solve(cache, grid, start, end, "dijkstra")
+    weighted, key, hit = cached_solve(cache, grid, start, end, "dijkstra", costs=costs)
+    assert key != plain_key and not hit and weighted != plain
+    assert cached_solve(cache, grid, start, end, "dijkstra", costs=costs.copy())[1:] == (key, True)
+    other = cost_plane(40, 30, 20.0, seed=5)
+    assert cached_solve(cache, grid, start, end, "dijkstra", costs=other)[1] != key
+    # Step-counting solvers share one key whatever the costs
+    bfs_key = cached_solve(cache, grid, start, end, "bfs")[1]
+    assert cached_solve(cache, grid, start, end, "bfs", costs=costs)[1:] == (bfs_key, True)
+
+def test_reads_are_consistent_while_another_thread_writes():
+    cache = LRUCache(max_bytes=64 * 100)
+    value = np.zeros(8, dtype=np.int64)
+    stop = threading.Event()
+    cache.put(0, value)
+
+    def write():
+        # Keys cycle within the budget, so key 0 is rewritten but never evicted
+        i = 0
+        while not stop.is_set():
+            cache.put(i % 100, value)
+            i += 1
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for _ in range(20000):
+            assert len(cache) <= 100
+            assert 0 in cache
+            repr(cache)
+    finally:
+        stop.set()
+        writer.join()
+    assert len(cache) == 100 and cache.nbytes == 64 * 100
@@ -0,0 +1,136 @@
+import random
+
+import numpy as np
+import pytest
+
+from maze_core import MazeTree, get_generator, solve_bfs
+from maze_core.edit import TiledWallMesh, regenerate_region, toggle_wall
+
+
+def assert_matches_fresh_tree(grid, tree):
+    """The patched tree answers like one built from scratch."""
+    fresh = MazeTree(grid, tree.root)
+    assert fresh.perfect == tree.perfect
+    assert np.array_equal(fresh.depth >= 0, tree.depth >= 0)
+    if tree.perfect:
+        assert np.array_equal(fresh.depth, tree.depth)
+    rng = random.Random(1)
+    for _ in range(30):
+        a = (rng.randrange(grid.width), rng.randrange(grid.height))
+        b = (rng.randrange(grid.width), rng.randrange(grid.height))
+        if not tree.connected(a, b):
+            continue
+        path = tree.path(a, b)
+        assert path[0] == a and path[-1] == b
+        for u, v in zip(path, path[1:]):
+            assert v in grid.open_neighbors(*u)
+        if tree.perfect:
+            assert len(path) == len(solve_bfs(grid, a, b))
+
+
+@pytest.mark.parametrize("algorithm", ["backtracker", "binary_tree", "tiled"])
+def test_random_edits_patch_tree_like_fresh_build(algorithm):
+    rng = random.Random(algorithm)
+    for trial in range(10):
+        w, h = rng.randint(2, 30), rng.randint(2, 30)
+        grid, _, _ = get_generator(algorithm)(w, h, seed=trial)
+        tree = MazeTree(grid, root=(rng.randrange(w), rng.randrange(h)))
+        for step in range(15):
+            if rng.random() < 0.5:
+                x0, y0 = rng.randrange(w), rng.randrange(h)
+                region = (x0, y0, rng.randint(x0 + 1, w), rng.randint(y0 + 1, h))
+                perfect = tree.perfect
+                regenerate_region(grid, region, seed=step, tree=tree)
+                # Regenerating keeps a perfect maze perfect
+                assert tree.perfect or not perfect
+            else:
+                x, y = rng.randrange(w), rng.randrange(h)
+                neighbours = [(x + dx, y + dy) for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                              if 0 <= x + dx < w and 0 <= y + dy < h]
+                toggle_wall(grid, (x, y), rng.choice(neighbours), tree=tree)
+            assert_matches_fresh_tree(grid, tree)
+
+
+def test_toggling_twice_restores_the_maze():
+    rng = random.Random(3)
+    grid, _, _ = get_generator("backtracker")(40, 40, seed=3)
+    tree = MazeTree(grid)
+    before = grid.copy()
+    for _ in range(20):
+        a = (rng.randrange(39), rng.randrange(40))
+        b = (a[0] + 1, a[1])
+        assert toggle_wall(grid, a, b, tree) != toggle_wall(grid, a, b, tree)
+        assert_matches_fresh_tree(grid, tree)
+    assert grid == before and tree.perfect
+
+
+def test_reopening_walls_inside_a_cut_off_part_rejoins_it():
+    grid, start, _ = get_generator("backtracker")(20, 20, seed=7)
+    tree = MazeTree(grid, start)
+    w = grid.width
+    cell = lambda i: (int(i) % w, int(i) // w)
+    parent = tree.parent.copy()
+    # Each e2 lies inside the subtree e1 cuts off, so it is a passage between
+    # two unreachable cells when it is reopened
+    children = [j for j in range(w * grid.height)
+                if parent[j] != j and parent[parent[j]] != parent[j]]
+    for j in children[::25]:
+        i = parent[j]
+        e1, e2 = (cell(i), cell(parent[i])), (cell(j), cell(i))
+        for a, b in (e1, e2, e2, e1):
+            toggle_wall(grid, a, b, tree)
+        fresh = MazeTree(grid, start)
+        assert tree.perfect and fresh.perfect
+        assert np.array_equal(tree.parent, fresh.parent)
+        assert np.array_equal(tree.depth, fresh.depth)
+        assert tree.path(start, cell(j)) == fresh.path(start, cell(j))
+
+
+def test_regenerating_after_reopened_walls_keeps_the_maze_perfect():
+    grid, start, _ = get_generator("backtracker")(20, 20, seed=7)
+    tree = MazeTree(grid, start)
+    w = grid.width
+    cell = lambda i: (int(i) % w, int(i) // w)
+    j = int(np.argmax(tree.depth))
+    i = int(tree.parent[j])
+    e1, e2 = (cell(i), cell(tree.parent[i])), (cell(j), cell(i))
+    for a, b in (e1, e2, e2, e1):
+        toggle_wall(grid, a, b, tree)
+    regenerate_region(grid, (2, 2, 14, 14), seed=1, tree=tree)
+    assert tree.perfect and MazeTree(grid, start).perfect
+    assert int(grid.degrees().sum()) == 2 * (w * grid.height - 1)
+
+
+def test_edit_errors():
+    grid, _, _ = get_generator("backtracker")(10, 10, seed=0)
+    with pytest.raises(ValueError):
+        toggle_wall(grid, (3, 3), (5, 3))
+    with pytest.raises(ValueError):
+        toggle_wall(grid, (9, 9), (10, 9))
+    with pytest.raises(ValueError):
+        regenerate_region(grid, (4, 4, 4, 8))
+
+
+@pytest.mark.parametrize("thickness", [0.0, 0.1])
+def test_tiled_mesh_rebuilds_only_touched_tiles(thickness):
+    grid, start, end = get_generator("backtracker")(150, 130, seed=5)
+    args = (start, end, 1.0, 2.0, (-75.0, -65.0, -1.0), thickness)
+    mesh = TiledWallMesh(32)
+    mesh.update(grid, *args)
+    assert mesh.rebuilt == 5 * 5
+    mesh.update(grid, *args)
+    assert mesh.rebuilt == 0
+
+    toggle_wall(grid, (40, 40), (41, 40))
+    patched = mesh.update(grid, *args)
+    assert mesh.rebuilt == 1
+    fresh = TiledWallMesh(32).update(grid, *args)
+    for a, b in zip(patched, fresh):
+        assert a.dtype == b.dtype and np.array_equal(a, b)
+
+    regenerate_region(grid, (60, 10, 70, 20), seed=1)
+    patched = mesh.update(grid, *args)
+    assert mesh.rebuilt == 2
+    fresh = TiledWallMesh(32).update(grid, *args)
+    for a, b in zip(patched, fresh):
+        assert np.array_equal(a, b)
@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+import pytest
+
+from maze_core import MazeGrid, braid_maze, cost_plane, get_generator, load_maze, maze_seeds
+from maze_core.batch import build_one
+from maze_core.generate import generate_maze, get_random_perimeter_cell
+from maze_core.rng import BlockRandom
+
+
+def tuple_stack_maze(width, height, rng=None):
+    """The backtracker as it was before the bit-stack rewrite, kept as a reference.
+
+    ``rng`` is a BlockRandom or None for the global ``random`` module, which
+    is how the rewrite draws its numbers.
+    """
+    choose = rng or random
+    grid = MazeGrid(width, height)
+    start = get_random_perimeter_cell(width, height, rng=rng)
+    end = get_random_perimeter_cell(width, height, exclude_cell=start, rng=rng)
+    stack = [start]
+    visited = [[False] * width for _ in range(height)]
+    visited[start[1]][start[0]] = True
+    while stack:
+        x, y = stack[-1]
+        neighbors = []
+        if x > 0 and not visited[y][x - 1]:
+            neighbors.append((x - 1, y))
+        if x < width - 1 and not visited[y][x + 1]:
+            neighbors.append((x + 1, y))
+        if y > 0 and not visited[y - 1][x]:
+            neighbors.append((x, y - 1))
+        if y < height - 1 and not visited[y + 1][x]:
+            neighbors.append((x, y + 1))
+        if neighbors:
+            nx, ny = choose.choice(neighbors)
+            grid.remove_wall(x, y, nx, ny)
+            stack.append((nx, ny))
+            visited[ny][nx] = True
+        else:
+            stack.pop()
+    return grid, start, end
+
+
+def assert_same_maze(maze, reference):
+    grid, start, end = maze
+    expected, expected_start, expected_end = reference
+    assert (start, end) == (expected_start, expected_end)
+    assert np.array_equal(grid.horizontal, expected.horizontal)
+    assert np.array_equal(grid.vertical, expected.vertical)
+
+
+@pytest.mark.parametrize("width, height", [(1, 2), (2, 1), (3, 3), (17, 5), (40, 64), (101, 99)])
+def test_bit_stack_backtracker_matches_tuple_stack_reference(width, height):
+    for seed in range(8):
+        assert_same_maze(generate_maze(width, height, rng=seed),
+                         tuple_stack_maze(width, height, BlockRandom(seed)))
+        random.seed(seed)
+        maze = generate_maze(width, height)
+        random.seed(seed)
+        assert_same_maze(maze, tuple_stack_maze(width, height))
+
+
+def test_maze_seeds_keep_the_carving_seed_and_split_the_rest():
+    carve, braid, costs = maze_seeds(11)
+    assert carve == 11
+    streams = [np.random.default_rng(s).random(8) for s in (carve, braid, costs)]
+    assert not np.allclose(streams[0], streams[1])
+    assert not np.allclose(streams[1], streams[2])
+    again = maze_seeds(11)
+    assert (np.random.default_rng(again[1]).random(8) == streams[1]).all()
+    assert maze_seeds(None) == (None, None, None)
+
+
+def test_batch_maze_matches_its_seed(tmp_path):
+    seed = 5
+    build_one((0, seed, (30, 30), (20, 20), "backtracker", 0.5, 3.0, "dijkstra",
+               str(tmp_path), None))
+    grid, start, end, saved_seed, _, costs = load_maze(str(tmp_path / "maze_000000.npz"))
+
+    carve, braid, cost = maze_seeds(seed)
+    expected, expected_start, expected_end = get_generator("backtracker")(30, 20, seed=carve)
+    braid_maze(expected, 0.5, seed=braid)
+    assert saved_seed == seed
+    assert (start, end) == (expected_start, expected_end)
+    assert grid == expected
+    assert (costs == cost_plane(30, 20, 3.0, seed=cost)).all()
@@ -0,0 +1,96 @@
+import zlib
+
+import numpy as np
+import pytest
+
+from maze_core import (MazeGrid, braid_maze, cost_plane, get_generator, get_solver,
+                       load_maze, pack_maze, save_maze, unpack_maze)
+from maze_core.solve import path_cost
+from maze_core.storage import _BLOB_HEADER, BLOB_MAGIC
+
+
+def open_grid(width, height):
+    """A maze with only its outer walls."""
+    horizontal = np.zeros((height + 1, width), dtype=np.uint8)
+    vertical = np.zeros((height, width + 1), dtype=np.uint8)
+    horizontal[[0, -1]] = 1
+    vertical[:, [0, -1]] = 1
+    return MazeGrid(width, height, horizontal, vertical)
+
+
+@pytest.fixture
+def braided():
+    grid, start, end = get_generator("backtracker")(40, 30, seed=2)
+    braid_maze(grid, 1.0, seed=2)
+    return grid, start, end, cost_plane(40, 30, 20.0, seed=2)
+
+
+def test_weighted_route_detours_around_expensive_cells():
+    grid = open_grid(5, 3)
+    costs = np.ones((3, 5), dtype=np.float32)
+    costs[1, 1:4] = 50
+    start, end = (0, 1), (4, 1)
+    straight = get_solver("bfs")(grid, start, end)
+    weighted = get_solver("dijkstra", costs)(grid, start, end)
+    assert straight == [(x, 1) for x in range(5)]
+    assert weighted != straight
+    assert weighted[0] == start and weighted[-1] == end
+    assert path_cost(weighted, costs) < path_cost(straight, costs)
+    # Uniform costs are plain step counting
+    assert len(get_solver("dijkstra")(grid, start, end)) == len(straight)
+
+
+def test_cost_plane_route_is_cheapest(braided):
+    grid, start, end, costs = braided
+    assert costs.dtype == np.float32 and costs.shape == (30, 40)
+    assert costs.min() >= 1 and costs.max() <= 21
+    bfs = get_solver("bfs")(grid, start, end)
+    weighted = get_solver("dijkstra", costs)(grid, start, end)
+    assert weighted != bfs
+    assert path_cost(weighted, costs) < path_cost(bfs, costs)
+    # Unweighted solvers ignore the costs
+    assert get_solver("bfs", costs)(grid, start, end) == bfs
+
+
+def test_cost_plane_is_seeded():
+    assert (cost_plane(20, 10, seed=3) == cost_plane(20, 10, seed=3)).all()
+    assert (cost_plane(20, 10, 0.0, seed=3) == 1).all()
+    with pytest.raises(ValueError):
+        cost_plane(20, 10, -1.0)
+
+
+def test_costs_round_trip_through_blob(braided):
+    grid, start, end, costs = braided
+    for blob_costs in (costs, None):
+        out, out_start, out_end, seed, out_costs = unpack_maze(
+            pack_maze(grid, start, end, 7, blob_costs))
+        assert (out.horizontal == grid.horizontal).all()
+        assert (out.vertical == grid.vertical).all()
+        assert (out_start, out_end, seed) == (start, end, 7)
+        if blob_costs is None:
+            assert out_costs is None
+        else:
+            assert out_costs.dtype == np.float32 and (out_costs == costs).all()
+
+
+def test_version_1_blob_still_reads(braided):
+    grid, start, end, _ = braided
+    bits = np.packbits(np.concatenate([grid.horizontal.ravel(), grid.vertical.ravel()]))
+    blob = _BLOB_HEADER.pack(BLOB_MAGIC, 1, grid.width, grid.height, *start, *end, -1) \
+        + zlib.compress(bits.tobytes())
+    out, out_start, out_end, seed, costs = unpack_maze(blob)
+    assert (out.horizontal == grid.horizontal).all()
+    assert (out.vertical == grid.vertical).all()
+    assert (out_start, out_end, seed, costs) == (start, end, None, None)
+
+
+def test_costs_round_trip_through_file(braided, tmp_path):
+    grid, start, end, costs = braided
+    path = str(tmp_path / "maze.npz")
+    save_maze(path, grid, start, end, seed=2, costs=costs)
+    assert (load_maze(path)[5] == costs).all()
+    save_maze(path, grid, start, end, seed=2)
+    assert load_maze(path)[5] is None
+    with pytest.raises(ValueError):
+        save_maze(path, grid, start, end, costs=costs.T)
+
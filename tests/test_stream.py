@@ -0,0 +1,46 @@
+import pytest
+
+from maze_core import StreamedMaze, export_maze, iter_mesh_tiles, write_streamed_maze
+
+
+@pytest.fixture
+def streamed(tmp_path):
+    path = tmp_path / "maze.lemz"
+    write_streamed_maze(str(path), 37, 53, seed=4)
+    return StreamedMaze(str(path))
+
+
+@pytest.mark.parametrize("thickness", [0.0, 0.2])
+@pytest.mark.parametrize("tile_size", [8, 16, 64])
+def test_strip_tiles_match_loaded_grid(streamed, thickness, tile_size):
+    grid = streamed.load()
+    strips = list(iter_mesh_tiles(streamed, streamed.start, streamed.end,
+                                  thickness=thickness, tile_size=tile_size))
+    loaded = list(iter_mesh_tiles(grid, streamed.start, streamed.end,
+                                  thickness=thickness, tile_size=tile_size))
+    assert [t[0] for t in strips] == [t[0] for t in loaded]
+    for (_, *a), (_, *b) in zip(strips, loaded):
+        for x, y in zip(a, b):
+            assert x.dtype == y.dtype and (x == y).all()
+
+
+@pytest.mark.parametrize("ext", [".glb", ".obj", ".stl"])
+def test_strip_export_matches_loaded_grid(streamed, tmp_path, ext):
+    grid = streamed.load()
+    # Same file name, since OBJ files name their .mtl
+    (tmp_path / "strips").mkdir()
+    (tmp_path / "loaded").mkdir()
+    a, b = tmp_path / "strips" / f"maze{ext}", tmp_path / "loaded" / f"maze{ext}"
+    export_maze(str(a), streamed, streamed.start, streamed.end, tile_size=16)
+    export_maze(str(b), grid, streamed.start, streamed.end, tile_size=16)
+    assert a.read_bytes() == b.read_bytes()
+
+
+def test_strips_own_each_wall_once(streamed):
+    """Strips cover every wall of the loaded maze exactly once."""
+    grid = streamed.load()
+    whole = sum(len(t[2]) for t in iter_mesh_tiles(grid, streamed.start, streamed.end,
+                                                   tile_size=1))
+    strips = sum(len(t[2]) for t in iter_mesh_tiles(streamed, streamed.start, streamed.end,
+                                                    tile_size=1))
+    assert strips == whole == 2 * int(grid.horizontal.sum() + grid.vertical.sum())